@@ -1,5 +1,7 @@
-from shared import read_text_file
-from typing import List
+from shared import read_int_array
+from collections import deque
+from typing import List, Sequence, Iterable
+import numpy as np
 
 
 def get_diffs(x: List[float]) -> List[float]:
@@ -18,14 +20,68 @@ def get_rolling_sums(x: List[float], n: int) -> List[float]:
     return [sum(x[i:i+n]) for i in range(len(x)-n+1)]
 
 
+def get_rolling_sums_array(x: Sequence[int], n: int) -> np.ndarray:
+    """Vectorized get_rolling_sums: each window is the difference of two cumulative sums."""
+    cumulative = np.concatenate([[0], np.cumsum(x, dtype=np.int64)])
+    return cumulative[n:] - cumulative[:-n]
+
+
+def count_window_increases(x: Sequence[int], n: int = 1) -> int:
+    """
+    Count the rolling sums (window of size n) that are greater than the previous one.
+    Neighboring windows share all but one value, so window i+1 minus window i is just
+    x[i+n] - x[i] and we never need to compute the sums themselves.
+    """
+    x = np.asarray(x)
+    return int(np.count_nonzero(x[n:] > x[:-n]))
+
+
+class WindowIncreaseCounter:
+    """
+    Running version of count_window_increases for readings that arrive one at a time
+    (e.g. from a pipe). Only the last n readings are kept.
+    """
+    def __init__(self, n: int = 1):
+        self.window = deque(maxlen=n)
+        self.count = 0
+
+    def add(self, reading: int):
+        if len(self.window) == self.window.maxlen:
+            self.count += reading > self.window[0]  # window[0] is about to drop out of the window
+        self.window.append(reading)
+
+    def add_many(self, readings: Iterable[int]):
+        for x in readings:
+            self.add(x)
+
+
+def count_stream_increases(lines: Iterable[str], n: int = 1) -> int:
+    """
+    Count window increases from an iterable of text lines without storing them, e.g.
+    count_stream_increases(sys.stdin, 3).
+    """
+    counter = WindowIncreaseCounter(n)
+    counter.add_many(int(x) for x in lines if x.strip())
+    return counter.count
+
+
+def parse_data(path: str) -> List[int]:
+    return read_int_array(path)
+
+
+def part_1(data: List[int]) -> int:
+    return count_window_increases(data, 1)
+
+
+def part_2(data: List[int]) -> int:
+    return count_window_increases(data, 3)
+
+
 if __name__ == "__main__":
-    data = read_text_file("data/01.txt", dtype=int)
+    data = parse_data("data/01.txt")
 
     ### Part 1
-    n = count_diffs_greater_than_zero(data)
-    print(f"solution 01a: {n}")
+    print(f"solution 01a: {part_1(data)}")
 
     ### Part 2
-    rolling_sums = get_rolling_sums(data, 3)
-    n = count_diffs_greater_than_zero(rolling_sums)
-    print(f"solution 01b: {n}")
+    print(f"solution 01b: {part_2(data)}")
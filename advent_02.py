@@ -1,5 +1,9 @@
-from shared import read_text_file
 from typing import List, Tuple
+import numpy as np
+
+
+# commands are identified by their first letter when parsing into arrays
+FORWARD, DOWN, UP = ord("f"), ord("d"), ord("u")
 
 
 def get_depth_and_horizontal_coordinates(data: List[str]) -> Tuple[int, int]:
@@ -61,13 +65,55 @@ def update_coordinates_and_aim(direction: str, current_aim: int) -> Tuple[int, i
     return map[d][0] * n, map[d][1] * n, map[d][2] * n
 
 
+def parse_commands(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse the commands into an array of direction codes (FORWARD, DOWN, or UP) and an
+    array of magnitudes. The file is split in one go and the conversions are done
+    by NumPy, so there is no Python work per line.
+    """
+    with open(path, "rb") as f:
+        tokens = f.read().split()
+    directions = np.array(tokens[0::2])
+    directions = directions.view(np.uint8).reshape(len(directions), -1)[:, 0]  # first letter of each direction
+    magnitudes = np.array(tokens[1::2]).astype(np.int64)
+    return directions, magnitudes
+
+
+def get_coordinates_vectorized(
+        directions: np.ndarray,
+        magnitudes: np.ndarray,
+) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """
+    Return the (depth, horizontal) coordinates without aim (part 1) and with aim (part 2).
+    Up and down change the depth in part 1 and the aim in part 2, and the aim at each
+    forward command is the cumulative sum of those changes.
+    """
+    forward = np.where(directions == FORWARD, magnitudes, 0)
+    vertical = np.where(directions == DOWN, magnitudes, 0) - np.where(directions == UP, magnitudes, 0)
+    horizontal = int(forward.sum())
+    aim = np.cumsum(vertical)
+    return (int(vertical.sum()), horizontal), (int((aim * forward).sum()), horizontal)
+
+
+def parse_data(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    return parse_commands(path)
+
+
+def part_1(data: Tuple[np.ndarray, np.ndarray]) -> int:
+    coords, _ = get_coordinates_vectorized(*data)
+    return coords[0] * coords[1]
+
+
+def part_2(data: Tuple[np.ndarray, np.ndarray]) -> int:
+    _, coords = get_coordinates_vectorized(*data)
+    return coords[0] * coords[1]
+
+
 if __name__ == "__main__":
-    data = read_text_file("data/02.txt", dtype=str)
+    data = parse_data("data/02.txt")
 
     ### Part 1
-    coords = get_depth_and_horizontal_coordinates(data)
-    print(f"solution 02a: {coords[0] * coords[1]}")
+    print(f"solution 02a: {part_1(data)}")
 
     ### Part 2
-    coords = get_depth_and_horizontal_coordinates_with_aim(data)
-    print(f"solution 02b: {coords[0] * coords[1]}")
+    print(f"solution 02b: {part_2(data)}")
@@ -1,5 +1,6 @@
-from shared import read_text_file
-from typing import List
+from shared import CHUNK_SIZE
+from typing import List, Tuple
+import numpy as np
 
 
 def get_most_common_digit_all_columns(data: List[str]) -> str:
@@ -62,17 +63,112 @@ def filter_to_digit(data: List[str], index: int, least: bool = False) -> List[st
     return [x for x in data if x[index] == digit]
 
 
+def parse_packed(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Read the report into an array of integers (one per line) and return it with the
+    number of digits per line. Every line must have the same number of digits.
+    """
+    with open(path, "rb") as f:
+        raw = f.read().replace(b"\r", b"").rstrip()  # allow CRLF line endings and blank lines at the end
+    width = raw.index(b"\n") if b"\n" in raw else len(raw)
+    if (len(raw) + 1) % (width + 1) != 0:
+        raise ValueError(f"every line must have {width} digits")
+    digits = np.frombuffer(raw + b"\n", dtype=np.uint8).reshape(-1, width + 1)[:, :width] - ord("0")
+    place_values = 1 << np.arange(width - 1, -1, -1, dtype=np.int64)
+    return digits @ place_values, width
+
+
+def count_ones_per_column(values: np.ndarray, width: int) -> List[int]:
+    """Count the 1s in each of the `width` binary places, from the leftmost place."""
+    return [int(np.count_nonzero(values & (1 << i))) for i in range(width - 1, -1, -1)]
+
+
+def get_gamma_and_epsilon(values: np.ndarray, width: int) -> Tuple[int, int]:
+    """Packed version of get_most_common_digit_all_columns (and flip_binary_digits)."""
+    return gamma_and_epsilon_from_counts(count_ones_per_column(values, width), len(values))
+
+
+def gamma_and_epsilon_from_counts(column_counts: List[int], n_lines: int) -> Tuple[int, int]:
+    gamma = 0
+    for ones in column_counts:
+        gamma = gamma * 2 + int(ones >= n_lines / 2)  # 1 if equally common
+    return gamma, gamma ^ ((1 << len(column_counts)) - 1)
+
+
+def count_ones_per_column_chunked(path: str, chunk_size: int = CHUNK_SIZE) -> Tuple[List[int], int]:
+    """
+    Count the 1s in each column (and the number of lines) by reading the file in blocks
+    of whole lines, so memory use depends on chunk_size rather than the file size.
+    """
+    with open(path, "rb") as f:
+        first_line = f.readline()
+        width = len(first_line.rstrip(b"\r\n"))
+        line_end = first_line[width:] or b"\n"  # "\n" or "\r\n"
+        line_length = width + len(line_end)
+        f.seek(0)
+        lines_per_chunk = max(chunk_size // line_length, 1)
+        counts = np.zeros(width, dtype=np.int64)
+        n_lines = 0
+        while chunk := f.read(lines_per_chunk * line_length):
+            # the last line of the file might have no line end, or be followed by blank lines
+            chunk = chunk.rstrip() + line_end
+            if chunk == line_end:
+                continue
+            if len(chunk) % line_length != 0:
+                raise ValueError(f"every line must have {width} digits and end with {line_end!r}")
+            digits = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, line_length)[:, :width] - ord("0")
+            counts += digits.sum(axis=0, dtype=np.int64)
+            n_lines += len(digits)
+    return [int(x) for x in counts], n_lines
+
+
+def get_gamma_and_epsilon_chunked(path: str, chunk_size: int = CHUNK_SIZE) -> Tuple[int, int]:
+    """Streaming version of get_gamma_and_epsilon that never holds the whole report."""
+    return gamma_and_epsilon_from_counts(*count_ones_per_column_chunked(path, chunk_size))
+
+
+def get_rating(sorted_values: np.ndarray, width: int, least: bool = False) -> int:
+    """
+    Packed version of recursive_filter. The values that are still in the running share
+    all of the places we've looked at so far, so they're a contiguous slice of the sorted
+    array and the ones with a 0 in the next place come before the ones with a 1. Each
+    place narrows the slice with one binary search instead of copying the filtered list.
+    """
+    lo, hi = 0, len(sorted_values)
+    prefix = 0
+    for i in range(width - 1, -1, -1):
+        if hi - lo == 1:
+            break
+        split = lo + int(np.searchsorted(sorted_values[lo:hi], prefix | (1 << i)))
+        zeros, ones = split - lo, hi - split
+        keep_ones = (ones < zeros if least else ones >= zeros) or zeros == 0
+        if ones and keep_ones:
+            lo, prefix = split, prefix | (1 << i)
+        else:
+            hi = split
+    return int(sorted_values[lo])
+
+
+def parse_data(path: str) -> Tuple[np.ndarray, int]:
+    return parse_packed(path)
+
+
+def part_1(data: Tuple[np.ndarray, int]) -> int:
+    gamma, epsilon = get_gamma_and_epsilon(*data)
+    return gamma * epsilon
+
+
+def part_2(data: Tuple[np.ndarray, int]) -> int:
+    values, width = data
+    sorted_values = np.sort(values)
+    return get_rating(sorted_values, width) * get_rating(sorted_values, width, least=True)
+
+
 if __name__ == "__main__":
-    data = read_text_file("data/03.txt", dtype=str)
+    data = parse_data("data/03.txt")
 
     ### Part 1
-    gamma = get_most_common_digit_all_columns(data)
-    epsilon = flip_binary_digits(gamma)
-    gamma = binary_to_decimal(gamma)
-    epsilon = binary_to_decimal(epsilon)
-    print(f"solution 03a: {gamma * epsilon}")
+    print(f"solution 03a: {part_1(data)}")
 
     ### Part 2
-    oxygen_rating = get_oxygen_rating(data)
-    co2_rating = get_co2_rating(data)
-    print(f"solution 03b: {oxygen_rating * co2_rating}")
+    print(f"solution 03b: {part_2(data)}")
@@ -1,21 +1,7 @@
 from shared import read_text_file
-from typing import List, Tuple
-
-
-MARKED_NUMBERS = {i: False for i in range(100)}
-
-
-def mark_number(x: int):
-    MARKED_NUMBERS[x] = True
-
-
-def is_marked(x: int):
-    return MARKED_NUMBERS[x]
-
-
-def reset_marked_numbers():
-    for i in MARKED_NUMBERS:
-        MARKED_NUMBERS[i] = False
+from collections import defaultdict
+from typing import List, Tuple, Dict, Set
+import numpy as np
 
 
 class Board:
@@ -24,24 +10,72 @@ class Board:
         self.rows = [parse_single_line_to_numbers(x) for x in board_data]
         self.columns = [[self.rows[i][j] for i in range(self.n)] for j in range(self.n)]
 
-    def row_is_complete(self, row_index) -> bool:
-        return all(is_marked(x) for x in self.rows[row_index])
+    def row_is_complete(self, row_index, marked: Set[int]) -> bool:
+        return all(x in marked for x in self.rows[row_index])
 
-    def column_is_complete(self, column_index) -> bool:
-        return all(is_marked(x) for x in self.columns[column_index])
+    def column_is_complete(self, column_index, marked: Set[int]) -> bool:
+        return all(x in marked for x in self.columns[column_index])
 
-    def any_rows_complete(self) -> bool:
-        return any(self.row_is_complete(i) for i in range(self.n))
+    def any_rows_complete(self, marked: Set[int]) -> bool:
+        return any(self.row_is_complete(i, marked) for i in range(self.n))
 
-    def any_columns_complete(self) -> bool:
-        return any(self.column_is_complete(j) for j in range(self.n))
+    def any_columns_complete(self, marked: Set[int]) -> bool:
+        return any(self.column_is_complete(j, marked) for j in range(self.n))
 
-    def board_is_complete(self):
-        return self.any_rows_complete() or self.any_columns_complete()
+    def board_is_complete(self, marked: Set[int]):
+        return self.any_rows_complete(marked) or self.any_columns_complete(marked)
 
-    def get_unmarked_numbers(self):
+    def get_unmarked_numbers(self, marked: Set[int]):
         all_numbers_on_board = [x for y in self.rows for x in y]
-        return [x for x in all_numbers_on_board if not is_marked(x)]
+        return [x for x in all_numbers_on_board if x not in marked]
+
+
+class BingoGame:
+    def __init__(self, boards: List[Board]):
+        """
+        self.marked: the numbers that have been called in this game
+
+        self.locations: keys are numbers, values are (board index, row, column) tuples
+        for every cell containing that number -- marking a number only touches these
+
+        self.row_hits / self.column_hits: number of marked cells in each row and column
+        of each board, so a line is complete when its count reaches the board size
+
+        self.winners: board indices in the order they won
+        """
+        self.boards = boards
+        self.marked: Set[int] = set()
+        self.locations: Dict[int, List[Tuple[int, int, int]]] = defaultdict(list)
+        for b, board in enumerate(boards):
+            for i, row in enumerate(board.rows):
+                for j, x in enumerate(row):
+                    self.locations[x].append((b, i, j))
+        self.row_hits = [[0] * board.n for board in boards]
+        self.column_hits = [[0] * board.n for board in boards]
+        self.has_won = [False] * len(boards)
+        self.winners: List[int] = []
+
+    def mark_number(self, x: int) -> List[int]:
+        """Mark a number and return the indices of any boards that won because of it."""
+        if x in self.marked:
+            return []
+        self.marked.add(x)
+        new_winners = []
+        for b, i, j in self.locations.get(x, []):
+            self.row_hits[b][i] += 1
+            self.column_hits[b][j] += 1
+            n = self.boards[b].n
+            if not self.has_won[b] and (self.row_hits[b][i] == n or self.column_hits[b][j] == n):
+                self.has_won[b] = True
+                new_winners.append(b)
+        self.winners.extend(new_winners)
+        return new_winners
+
+    def is_marked(self, x: int) -> bool:
+        return x in self.marked
+
+    def score(self, board: Board, last_number: int) -> int:
+        return calculate_board_score(board, last_number, self.marked)
 
 
 def parse_single_line_to_numbers(line: str) -> List[int]:
@@ -51,7 +85,6 @@ def parse_single_line_to_numbers(line: str) -> List[int]:
 
 def parse_order_and_boards(data: List[str]) -> Tuple[List[int], List[Board]]:
     """Parse the order and boards from the input data"""
-    reset_marked_numbers()
     order = [int(x) for x in data[0].split(",")]
     boards = []
     for i in range(2, len(data), 6):
@@ -60,60 +93,96 @@ def parse_order_and_boards(data: List[str]) -> Tuple[List[int], List[Board]]:
     return order, boards
 
 
-def find_winning_board(order: List[int], boards: List[Board]) -> Tuple[Board, int]:
+def find_winning_board(order: List[int], boards: List[Board]) -> Tuple[Board, int, BingoGame]:
     """
     Given the ordered list of numbers to be marked and the list of boards, return the
-    winning board and how many numbers were called to find the winner.
+    winning board, the index of the number that made it win, and the game (which knows
+    which numbers have been marked).
     """
-    # first four numbers can't result in a winner
-    [mark_number(x) for x in order[:4]]
-
-    # mark numbers one at a time and stop when we have a winner
-    for i, x in enumerate(order[4:]):
-        mark_number(x)
-        statuses = [x.board_is_complete() for x in boards]
-        if any(statuses):
-            winner = boards[statuses.index(True)]  # return the first winner
-            return winner, i + 4  # +4 because we processed the first four separately
+    game = BingoGame(boards)
+    for i, x in enumerate(order):
+        winners = game.mark_number(x)
+        if winners:
+            return boards[winners[0]], i, game  # return the first winner
 
     raise(ValueError("No winners found"))  # should never reach this point
 
 
-def find_losing_board(order: List[int], boards: List[Board]) -> Tuple[Board, int]:
-    """Return the last board to win and the index of the last number marked on the board."""
-    # first four numbers can't result in a winner
-    [mark_number(x) for x in order[:4]]
-
-    # mark numbers one at a time
-    for i, x in enumerate(order[4:]):
-        mark_number(x)
-        if len(boards) > 1:
-            # there are more boards remaining -- throw out the winners
-            boards = [x for x in boards if not x.board_is_complete()]
-        else:
-            # there is only one remaining board -- check if it's won yet
-            board = boards[0]
-            if board.board_is_complete():
-                return board, i + 4  # +4 because we processed the first four separately
+def find_losing_board(order: List[int], boards: List[Board]) -> Tuple[Board, int, BingoGame]:
+    """Return the last board to win, the index of the last number marked on the board, and the game."""
+    game = BingoGame(boards)
+    for i, x in enumerate(order):
+        game.mark_number(x)
+        if len(game.winners) == len(boards):
+            return boards[game.winners[-1]], i, game
 
     raise (ValueError("At least one board never wins"))  # should never reach this point
 
 
-def calculate_board_score(board: Board, last_number: int) -> int:
+def calculate_board_score(board: Board, last_number: int, marked: Set[int]) -> int:
     """Sum of all unmarked numbers times the last marked number."""
-    return sum(board.get_unmarked_numbers() * last_number)
+    return sum(board.get_unmarked_numbers(marked)) * last_number
+
+
+def get_win_turns(order: List[int], boards: List[Board]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the turn (index into order) on which every board wins, all at once. Stack the
+    boards into a (boards, n, n) array and replace each number with the turn it's called.
+    A line is complete on the latest turn in it, and a board wins on the earliest turn
+    that completes any of its lines. Boards that never win get len(order).
+
+    Returns the win turns and the array of cell turns.
+    """
+    board_array = np.array([board.rows for board in boards], dtype=np.int64)
+    never = len(order)
+    numbers, first_turns = np.unique(np.array(order, dtype=np.int64), return_index=True)
+    turns = np.full(max(board_array.max(), numbers.max()) + 1, never, dtype=np.int64)
+    turns[numbers] = first_turns
+    cell_turns = turns[board_array]
+    row_turns = cell_turns.max(axis=2).min(axis=1)
+    column_turns = cell_turns.max(axis=1).min(axis=1)
+    return np.minimum(row_turns, column_turns), cell_turns
+
+
+def score_first_and_last_winners(order: List[int], boards: List[Board]) -> Tuple[int, int]:
+    """
+    Vectorized version of find_winning_board and find_losing_board (plus scoring).
+    Ties go to the first board for the winner and the last board for the loser, which
+    is the order the boards win in when playing the game.
+    """
+    win_turns, cell_turns = get_win_turns(order, boards)
+    if win_turns.max() == len(order):
+        raise ValueError("At least one board never wins")
+    winner = int(np.argmin(win_turns))
+    loser = len(win_turns) - 1 - int(np.argmax(win_turns[::-1]))
+    scores = []
+    for b in [winner, loser]:
+        turn = win_turns[b]
+        unmarked = np.array(boards[b].rows)[cell_turns[b] > turn]
+        scores.append(int(unmarked.sum()) * order[turn])
+    return scores[0], scores[1]
+
+
+def parse_data(path: str) -> Tuple[List[int], List[Board]]:
+    data = read_text_file(path, dtype=str)
+    return parse_order_and_boards(data)
+
+
+def part_1(data: Tuple[List[int], List[Board]]) -> int:
+    order, boards = data
+    return score_first_and_last_winners(order, boards)[0]
+
+
+def part_2(data: Tuple[List[int], List[Board]]) -> int:
+    order, boards = data
+    return score_first_and_last_winners(order, boards)[1]
 
 
 if __name__ == "__main__":
-    data = read_text_file("data/04.txt", dtype=str)
-    order, boards = parse_order_and_boards(data)
+    data = parse_data("data/04.txt")
 
     ### Part 1
-    winner, n = find_winning_board(order, boards)
-    solution = calculate_board_score(winner, order[n])
-    print(f"solution 04a: {solution}")
+    print(f"solution 04a: {part_1(data)}")
 
     ### Part 2
-    loser, n = find_losing_board(order, boards)
-    solution = calculate_board_score(loser, order[n])
-    print(f"solution 04b: {solution}")
+    print(f"solution 04b: {part_2(data)}")
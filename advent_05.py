@@ -1,6 +1,31 @@
 from shared import read_text_file
-from collections import defaultdict
-from typing import List
+from collections import defaultdict, namedtuple
+from itertools import combinations
+from typing import List, Tuple, Dict, Generator
+import re
+import numpy as np
+
+
+# above this many cells, count overlaps from the list of covered cells instead of a dense grid
+DENSE_GRID_LIMIT = 1 << 26  # 256 MB of int32 counts
+# max number of points rasterized at once (a single longer line is still done in one go)
+RASTER_BATCH_POINTS = 1 << 20
+# max number of candidate line crossings checked at once by the sweep line engine
+CROSSING_CHUNK_SIZE = 10 ** 6
+
+# Each family of parallel lines is described by the key of a point (constant along a line,
+# e.g. y for horizontal lines), the parameter of a point (its position along the line),
+# and the inverse: the (x, y) point for a key and parameter.
+LineFamily = namedtuple("LineFamily", ["key", "param", "point"])
+LINE_FAMILIES = {
+    "horizontal": LineFamily(lambda x, y: y, lambda x, y: x, lambda k, t: (t, k)),
+    "vertical": LineFamily(lambda x, y: x, lambda x, y: y, lambda k, t: (k, t)),
+    "diagonal_up": LineFamily(lambda x, y: x - y, lambda x, y: x, lambda k, t: (t, t - k)),
+    "diagonal_down": LineFamily(lambda x, y: x + y, lambda x, y: x, lambda k, t: (t, k - t)),
+}
+
+# runs of constant coverage along the lines in one family: key, first and last parameter, coverage
+Runs = namedtuple("Runs", ["key", "start", "end", "coverage"])
 
 
 class Point:
@@ -48,7 +73,7 @@ class Grid:
         return len([x for x in self.point_counts.values() if x >= min_value])
 
 
-def parse_data(path: str) -> List[Line]:
+def parse_lines(path: str) -> List[Line]:
     data = read_text_file(path, dtype=str)
     return [parse_line(x) for x in data]
 
@@ -60,19 +85,265 @@ def parse_line(text_line: str) -> Line:
     return Line(Point(start[0], start[1]), Point(end[0], end[1]))
 
 
+def parse_endpoints(path: str) -> np.ndarray:
+    """Read the lines into an (n, 4) array of x1, y1, x2, y2 values."""
+    with open(path, "rb") as f:
+        values = re.findall(rb"-?\d+", f.read())
+    return np.array(values, dtype=np.int64).reshape(-1, 4)
+
+
+def lines_to_endpoints(lines: List[Line]) -> np.ndarray:
+    return np.array([[x.start.x, x.start.y, x.end.x, x.end.y] for x in lines], dtype=np.int64).reshape(-1, 4)
+
+
+def filter_horizontal_and_vertical(endpoints: np.ndarray) -> np.ndarray:
+    return endpoints[(endpoints[:, 0] == endpoints[:, 2]) | (endpoints[:, 1] == endpoints[:, 3])]
+
+
+def rasterize(endpoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return x and y arrays of every point on every line (horizontal, vertical, or 45
+    degree diagonal), with a point repeated once per line it's on. Each line k has
+    n_k points start + t * step for t = 0, ..., n_k - 1, so we repeat each line's start
+    and step n_k times and build all of the t values with one arange.
+    """
+    x1, y1, x2, y2 = endpoints.T
+    x_step, y_step = np.sign(x2 - x1), np.sign(y2 - y1)
+    n_points = get_line_lengths(endpoints)
+    line_starts = np.cumsum(n_points) - n_points  # index of each line's first point in the output
+    t = np.arange(n_points.sum()) - np.repeat(line_starts, n_points)
+    xs = np.repeat(x1, n_points) + t * np.repeat(x_step, n_points)
+    ys = np.repeat(y1, n_points) + t * np.repeat(y_step, n_points)
+    return xs, ys
+
+
+def get_line_lengths(endpoints: np.ndarray) -> np.ndarray:
+    """Number of points on each line."""
+    x1, y1, x2, y2 = endpoints.T
+    return np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)) + 1
+
+
+def iter_line_batches(endpoints: np.ndarray, max_points: int = RASTER_BATCH_POINTS) -> Generator[np.ndarray, None, None]:
+    """Split the lines into consecutive batches with at most max_points points between them."""
+    ends = np.cumsum(get_line_lengths(endpoints))
+    start = 0
+    while start < len(endpoints):
+        done = int(ends[start - 1]) if start > 0 else 0
+        stop = max(int(np.searchsorted(ends, done + max_points, side="right")), start + 1)
+        yield endpoints[start:stop]
+        start = stop
+
+
+def merge_counts(
+        values: np.ndarray,
+        counts: np.ndarray,
+        new_values: np.ndarray,
+        new_counts: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Combine two sorted lists of unique values and their counts into one."""
+    position = np.searchsorted(values, new_values)
+    found = position < len(values)
+    found[found] = values[position[found]] == new_values[found]
+    counts[position[found]] += new_counts[found]
+    return (
+        np.insert(values, position[~found], new_values[~found]),
+        np.insert(counts, position[~found], new_counts[~found]),
+    )
+
+
+def count_overlapping_points(
+        endpoints: np.ndarray,
+        min_value: int = 2,
+        dense_limit: int = DENSE_GRID_LIMIT,
+        batch_points: int = RASTER_BATCH_POINTS,
+) -> int:
+    """
+    Vectorized version of marking every line on a Grid and calling count_marked_points.
+    The lines are sorted from top to bottom and rasterized a batch at a time, so memory
+    for the points depends on batch_points rather than the total length of the lines.
+
+    If the bounding box is small enough, each batch is added into a dense int32 grid of
+    counts. Otherwise each batch's points are counted with np.unique and merged into a
+    running list of counts. Lines in later batches start at or below the top of the
+    last line in this batch, so the rows above it are finished and can be dropped.
+    """
+    if len(endpoints) == 0:
+        return 0
+    endpoints = endpoints[np.argsort(np.minimum(endpoints[:, 1], endpoints[:, 3]), kind="stable")]
+    x_min, y_min = int(endpoints[:, [0, 2]].min()), int(endpoints[:, [1, 3]].min())
+    width = int(endpoints[:, [0, 2]].max()) - x_min + 1
+    height = int(endpoints[:, [1, 3]].max()) - y_min + 1
+
+    if width * height <= dense_limit:
+        grid = np.zeros(width * height, dtype=np.int32)
+        for batch in iter_line_batches(endpoints, batch_points):
+            xs, ys = rasterize(batch)
+            index = (ys - y_min) * width + (xs - x_min)
+            low, high = int(index.min()), int(index.max())
+            if high - low < 4 * len(index):
+                grid[low:high + 1] += np.bincount(index - low, minlength=high - low + 1).astype(np.int32)
+            else:  # a few long lines spread over a big area
+                values, counts = np.unique(index, return_counts=True)
+                grid[values] += counts.astype(np.int32)
+        return int(np.count_nonzero(grid >= min_value))
+
+    n_overlapping = 0
+    values, counts = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    for batch in iter_line_batches(endpoints, batch_points):
+        xs, ys = rasterize(batch)
+        values, counts = merge_counts(values, counts, *np.unique((ys - y_min) * width + (xs - x_min), return_counts=True))
+        finished = int(np.searchsorted(values, (min(batch[-1, 1], batch[-1, 3]) - y_min) * width))
+        n_overlapping += int(np.count_nonzero(counts[:finished] >= min_value))
+        values, counts = values[finished:], counts[finished:]
+    return n_overlapping + int(np.count_nonzero(counts >= min_value))
+
+
+def split_into_families(endpoints: np.ndarray) -> Dict[str, np.ndarray]:
+    """Split the lines by family into (n, 3) arrays of key, first parameter, last parameter."""
+    x1, y1, x2, y2 = endpoints.T
+    dx, dy = x2 - x1, y2 - y1
+    masks = {
+        "horizontal": dy == 0,  # single points count as horizontal
+        "vertical": (dx == 0) & (dy != 0),
+        "diagonal_up": (dx == dy) & (dx != 0),
+        "diagonal_down": (dx == -dy) & (dx != 0),
+    }
+    if not np.logical_or.reduce(list(masks.values())).all():
+        raise ValueError("lines must be horizontal, vertical, or 45 degree diagonals")
+    out = {}
+    for name, mask in masks.items():
+        family = LINE_FAMILIES[name]
+        key = family.key(x1[mask], y1[mask])
+        t1, t2 = family.param(x1[mask], y1[mask]), family.param(x2[mask], y2[mask])
+        out[name] = np.stack([key, np.minimum(t1, t2), np.maximum(t1, t2)], axis=1)
+    return out
+
+
+def sweep_family(segments: np.ndarray) -> Runs:
+    """
+    Merge the segments of one family into runs of constant coverage. Each segment adds
+    +1 at its first parameter and -1 just past its last, and sweeping the sorted events
+    (per key) with a cumulative sum gives the coverage between consecutive events.
+    """
+    key, t1, t2 = segments.T
+    keys = np.concatenate([key, key])
+    positions = np.concatenate([t1, t2 + 1])
+    deltas = np.concatenate([np.ones_like(t1), -np.ones_like(t2)])
+    order = np.lexsort((positions, keys))
+    keys, positions = keys[order], positions[order]
+    coverage = np.cumsum(deltas[order])  # each key's deltas sum to zero, so one cumsum works for all keys
+
+    # only the last event at each (key, position) gives the coverage from there on
+    last = np.ones(len(keys), dtype=bool)
+    last[:-1] = (keys[1:] != keys[:-1]) | (positions[1:] != positions[:-1])
+    keys, positions, coverage = keys[last], positions[last], coverage[last]
+
+    valid = (keys[:-1] == keys[1:]) & (coverage[:-1] > 0)
+    return Runs(keys[:-1][valid], positions[:-1][valid], positions[1:][valid] - 1, coverage[:-1][valid])
+
+
+def find_crossings(
+        runs_a: Runs,
+        family_a: LineFamily,
+        runs_b: Runs,
+        family_b: LineFamily,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the points where runs from two different families cross. Along a run in family
+    a, family b's key changes linearly (key_b = alpha * t + beta), so the runs in b that
+    can cross it are a contiguous slice of b sorted by key. Each candidate is then
+    checked for an integer crossing point that lies within both runs.
+
+    Returns the x, y of each crossing and the coverage of the a and b runs there.
+    """
+    order = np.argsort(runs_b.key, kind="stable")
+    b_key, b_start, b_end, b_coverage = (x[order] for x in runs_b)
+    out = []
+    chunk_size = max(CROSSING_CHUNK_SIZE // max(len(b_key), 1), 1)  # runs from a per chunk
+    for i in range(0, len(runs_a.key), chunk_size):
+        a_key, a_start, a_end, a_coverage = (x[i:i + chunk_size] for x in runs_a)
+        beta = family_b.key(*family_a.point(a_key, np.zeros_like(a_key)))
+        alpha = family_b.key(*family_a.point(a_key, np.ones_like(a_key))) - beta
+        k1, k2 = alpha * a_start + beta, alpha * a_end + beta
+        lo = np.searchsorted(b_key, np.minimum(k1, k2), side="left")
+        hi = np.searchsorted(b_key, np.maximum(k1, k2), side="right")
+
+        # expand into (a, b) candidate pairs, like rasterize does for points on a line
+        n = hi - lo
+        a_index = np.repeat(np.arange(len(a_key)), n)
+        b_index = np.repeat(lo, n) + np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+
+        numerator = b_key[b_index] - beta[a_index]
+        t = numerator // alpha[a_index]
+        ok = (t * alpha[a_index] == numerator) & (t >= a_start[a_index]) & (t <= a_end[a_index])
+        x, y = family_a.point(a_key[a_index], t)
+        t_b = family_b.param(x, y)
+        ok &= (t_b >= b_start[b_index]) & (t_b <= b_end[b_index])
+        out.append((x[ok], y[ok], a_coverage[a_index][ok], b_coverage[b_index][ok]))
+
+    if not out:
+        return tuple(np.zeros(0, dtype=np.int64) for _ in range(4))
+    return tuple(np.concatenate(x) for x in zip(*out))
+
+
+def count_overlapping_points_sweep(endpoints: np.ndarray, min_value: int = 2) -> int:
+    """
+    Count the points covered by at least min_value lines without visiting every point,
+    so the run time doesn't depend on the line lengths.
+
+    Within a family, coverage comes from sweep_family's runs, so the answer is the total
+    length of the runs with enough coverage -- except at points where families cross.
+    Those are found with find_crossings and corrected: remove them from the run totals
+    and count them again using the summed coverage of every family at that point.
+    """
+    if len(endpoints) == 0:
+        return 0
+    families = split_into_families(endpoints)
+    runs = {name: sweep_family(segments) for name, segments in families.items()}
+    total = sum(int((x.end - x.start + 1)[x.coverage >= min_value].sum()) for x in runs.values())
+
+    # encode points as integers so we can find repeats with np.unique
+    x_min, y_min = endpoints[:, [0, 2]].min(), endpoints[:, [1, 3]].min()
+    width = int(endpoints[:, [0, 2]].max() - x_min) + 1
+    n_families = len(LINE_FAMILIES)
+    codes, coverages = [], []
+    for (i, name_a), (j, name_b) in combinations(enumerate(LINE_FAMILIES), 2):
+        x, y, coverage_a, coverage_b = find_crossings(
+            runs[name_a], LINE_FAMILIES[name_a], runs[name_b], LINE_FAMILIES[name_b],
+        )
+        point = (y - y_min) * width + (x - x_min)
+        codes.extend([point * n_families + i, point * n_families + j])
+        coverages.extend([coverage_a, coverage_b])
+    if not codes:
+        return total
+
+    # a point's run in one family can show up in several crossings -- only count it once
+    codes, index = np.unique(np.concatenate(codes), return_index=True)
+    coverages = np.concatenate(coverages)[index]
+    total -= int(np.count_nonzero(coverages >= min_value))
+    _, point_index = np.unique(codes // n_families, return_inverse=True)
+    point_coverage = np.bincount(point_index, weights=coverages)
+    return total + int(np.count_nonzero(point_coverage >= min_value))
+
+
+def parse_data(path: str) -> np.ndarray:
+    return parse_endpoints(path)
+
+
+def part_1(data: np.ndarray) -> int:
+    return count_overlapping_points(filter_horizontal_and_vertical(data), min_value=2)
+
+
+def part_2(data: np.ndarray) -> int:
+    # same thing, but with all of the lines
+    return count_overlapping_points(data, min_value=2)
+
+
 if __name__ == "__main__":
     data = parse_data("data/05.txt")
 
     ### Part 1
-    grid = Grid()
-    data_subset = [x for x in data if x.is_horizontal() or x.is_vertical()]
-    for line in data_subset:
-        grid.mark_line(line)
-    print(f"solution 05a: {grid.count_marked_points(min_value=2)}")
+    print(f"solution 05a: {part_1(data)}")
 
     ### Part 2
-    # same thing, but with data rather than data_subset
-    grid = Grid()
-    for line in data:
-        grid.mark_line(line)
-    print(f"solution 05b: {grid.count_marked_points(min_value=2)}")
+    print(f"solution 05b: {part_2(data)}")
@@ -1,21 +1,51 @@
 from __future__ import annotations  # this just allows type hinting a class method to return the same class
 
-from shared import read_text_file
-from typing import List, Any
+from collections import defaultdict
+from shared import read_int_array
+from typing import List, Optional, Sequence
+import numpy as np
 
 
 CYCLE_LENGTH = 7
 NEW_FISH_EXTRA = 2
 
 
-def rotate_list(x: List[Any]) -> List[Any]:
+def get_transition_matrix() -> List[List[int]]:
     """
-    Rotate the elements in a list by one position.
-    Example:
-    >>> rotate_list([1, 2, 3, 4, 5])
-    [2, 3, 4, 5, 1]
+    Matrix M such that M times the counts for one day gives the counts for the next day:
+    every timer goes down by one, and fish at zero move to CYCLE_LENGTH - 1 and also
+    produce a new fish at the max timer value.
     """
-    return x[1:] + x[:1]
+    n_states = CYCLE_LENGTH + NEW_FISH_EXTRA
+    m = [[0] * n_states for _ in range(n_states)]
+    for i in range(n_states - 1):
+        m[i][i + 1] = 1
+    m[CYCLE_LENGTH - 1][0] = 1
+    m[n_states - 1][0] = 1
+    return m
+
+
+def matrix_multiply(a: List[List[int]], b: List[List[int]], modulus: Optional[int] = None) -> List[List[int]]:
+    """
+    Multiply lists of lists of Python ints, so the results are exact (no overflow).
+    Optionally reduce the results mod some number.
+    """
+    b_columns = list(zip(*b))
+    out = [[sum(x * y for x, y in zip(row, column)) for column in b_columns] for row in a]
+    if modulus:
+        out = [[x % modulus for x in row] for row in out]
+    return out
+
+
+def matrix_power(m: List[List[int]], n: int, modulus: Optional[int] = None) -> List[List[int]]:
+    """Raise a square matrix to the nth power by repeated squaring (O(log n) multiplies)."""
+    result = [[int(i == j) for j in range(len(m))] for i in range(len(m))]
+    while n > 0:
+        if n % 2 == 1:
+            result = matrix_multiply(result, m, modulus)
+        m = matrix_multiply(m, m, modulus)
+        n //= 2
+    return result
 
 
 class FishTank:
@@ -25,32 +55,106 @@ class FishTank:
 
     def advance_n_days(self, n: int):
         """
-        Rotate counts because each fish becomes one day closer to reproducing. Fish with
-        zero days left produce new fish with the max value (handled by the rotation) and
-        need to be reset to CYCLE_LENGTH (handled by adding to the appropriate count).
+        Each fish becomes one day closer to reproducing, so the counts rotate. Rather
+        than rotating the list, treat it as a ring buffer and move the position of timer
+        zero instead. Fish with zero days left produce new fish with the max value
+        (that slot becomes the end of the ring) and need to be reset to CYCLE_LENGTH
+        (handled by adding to the appropriate count).
         """
+        n_states = len(self.counts)
+        zero = 0  # position of timer zero in self.counts
         for _ in range(n):
-            self.counts = rotate_list(self.counts)
-            self.counts[CYCLE_LENGTH - 1] += self.counts[CYCLE_LENGTH + NEW_FISH_EXTRA - 1]
+            reproducing = self.counts[zero]
+            zero = (zero + 1) % n_states
+            self.counts[(zero + CYCLE_LENGTH - 1) % n_states] += reproducing
+        self.counts[:] = self.counts[zero:] + self.counts[:zero]
+
+    def advance_n_days_matrix(self, n: int, modulus: Optional[int] = None):
+        """
+        Advance n days in O(log n) matrix multiplies with the one-day transition matrix.
+        The counts grow by about 0.13 bits per day, so for huge n the big int arithmetic
+        dominates -- pass a modulus to get the counts mod that number instead.
+        """
+        m = matrix_power(get_transition_matrix(), n, modulus)
+        self.counts = [sum(x * y for x, y in zip(row, self.counts)) for row in m]
+        if modulus:
+            self.counts = [x % modulus for x in self.counts]
 
     def count_fish(self):
         return sum(self.counts)
 
 
+def count_initial_timers(populations: Sequence[Sequence[int]]) -> np.ndarray:
+    """Turn a list of starting populations into a (populations, timers) array of counts."""
+    n_states = CYCLE_LENGTH + NEW_FISH_EXTRA
+    timers = np.concatenate([np.asarray(x, dtype=np.int64) for x in populations] or [np.zeros(0, dtype=np.int64)])
+    if len(timers) and (timers.min() < 0 or timers.max() >= n_states):
+        raise ValueError(f"timers must be between 0 and {n_states - 1}")
+    population_ids = np.repeat(np.arange(len(populations)), [len(x) for x in populations])
+    counts = np.bincount(population_ids * n_states + timers, minlength=len(populations) * n_states)
+    return counts.reshape(len(populations), n_states)
+
+
+def get_descendant_counts(days: Sequence[int]) -> List[List[int]]:
+    """
+    For each number of days, the number of fish that a single fish with each timer value
+    turns into. After d days a fish with timer t > 0 has as many descendants as a fish
+    with timer t - 1 has after d - 1 days, and a fish with timer 0 has as many as a fish
+    with timer CYCLE_LENGTH - 1 plus a new fish. Returns a (timers, days) list of lists.
+    """
+    n_states = CYCLE_LENGTH + NEW_FISH_EXTRA
+    if any(d < 0 for d in days):
+        raise ValueError("number of days can't be negative")
+    columns = defaultdict(list)  # only the requested days are kept, as the loop passes them
+    for i, d in enumerate(days):
+        columns[d].append(i)
+    out = [[0] * len(days) for _ in range(n_states)]
+    counts = [1] * n_states  # day 0: every fish is just itself
+    for d in range(max(days, default=0) + 1):
+        if d > 0:
+            counts = [counts[CYCLE_LENGTH - 1] + counts[n_states - 1]] + counts[:-1]
+        for i in columns.get(d, []):
+            for t in range(n_states):
+                out[t][i] = counts[t]
+    return out
+
+
+def project_populations(populations: Sequence[Sequence[int]], days: Sequence[int]) -> np.ndarray:
+    """
+    Count the fish for every starting population after every number of days, returning
+    a (populations, days) table. The transition is the same for every population, so
+    the table is just the timer counts times the descendant counts per timer. Counts
+    are int64 when they fit and exact Python ints (object dtype) otherwise.
+    """
+    counts = count_initial_timers(populations)
+    descendants = get_descendant_counts(days)
+    # the descendant counts have to fit on their own too, even if there are no fish
+    largest = max((y for x in descendants for y in x), default=0) * max(int(counts.sum(axis=1).max(initial=0)), 1)
+    dtype = np.int64 if largest < 2 ** 63 else object
+    return counts.astype(dtype) @ np.array(descendants, dtype=dtype)
+
+
 def parse_data(path: str) -> List[int]:
-    data = read_text_file(path, dtype=str)
-    return [int(x) for x in data[0].split(",")]
+    return read_int_array(path)
+
+
+def part_1(data: List[int]) -> int:
+    tank = FishTank(data=data)
+    tank.advance_n_days(80)
+    return tank.count_fish()
+
+
+def part_2(data: List[int]) -> int:
+    tank = FishTank(data=data)
+    tank.advance_n_days(256)
+    return tank.count_fish()
 
 
 if __name__ == "__main__":
     data = parse_data("data/06.txt")
 
     ### Part 1
-    tank = FishTank(data=data)
-    tank.advance_n_days(80)
-    print(f"solution 06a: {tank.count_fish()}")
+    print(f"solution 06a: {part_1(data)}")
 
     ### Part 2
-    tank = FishTank(data=data)
-    tank.advance_n_days(256)
-    print(f"solution 06b: {tank.count_fish()}")
+    print(f"solution 06b: {part_2(data)}")
@@ -1,10 +1,11 @@
-from shared import read_text_file
+from shared import read_int_array
 from statistics import median
 from typing import List, Tuple, Callable
+import numpy as np
 
 
 def parse_data(path: str):
-    return [int(x) for x in read_text_file(path, dtype=str)[0].split(",")]
+    return read_int_array(path)
 
 
 def get_min_position_and_distance(values: List[int], distance_function: Callable = None) -> Tuple[int, int]:
@@ -15,7 +16,7 @@ def get_min_position_and_distance(values: List[int], distance_function: Callable
     else:
         # otherwise calculate with brute force
         d = dict()
-        for i in range(min(values), max(values)):
+        for i in range(min(values), max(values) + 1):
             d[i] = sum(distance_function(x, i) for x in values)
         argmin = min(d, key=d.get)
         return argmin, d[argmin]
@@ -27,16 +28,92 @@ def triangle_number_distance(a: int, b: int):
 
 
 def triangle_number(n: int):
-    return n * (n + 1) / 2
+    return n * (n + 1) // 2
+
+
+def get_all_costs(values: List[int], triangle: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return every candidate position from min(values) to max(values) and the total fuel
+    cost of moving all crabs there, in O(n + range). With a histogram of the crab
+    positions, prefix sums of the counts and of the positions give the number and sum
+    of crabs on each side of a position, which is all the linear cost needs:
+        sum |x - p| = (p * n_left - sum_left) + (sum_right - p * n_right)
+    The triangle cost is (sum (x - p)^2 + sum |x - p|) / 2, and the squared part expands
+    to sum x^2 - 2p sum x + n p^2, so it only needs totals.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    low, high = int(values.min()), int(values.max())
+    n = len(values)
+    # exact Python ints (object dtype) if the sums could overflow int64
+    dtype = np.int64 if n * (high - low + 1) ** 2 < 2 ** 62 and n * max(abs(low), abs(high)) ** 2 < 2 ** 62 else object
+
+    counts = np.bincount(values - low).astype(dtype)
+    positions = np.arange(low, high + 1).astype(dtype)
+    n_left = np.cumsum(counts)  # crabs at or left of each position
+    sum_left = np.cumsum(counts * positions)
+    total = sum_left[-1]
+    costs = (positions * n_left - sum_left) + ((total - sum_left) - positions * (n - n_left))
+    if triangle:
+        squares = sum(int(x) ** 2 for x in values) if dtype is object else int((values * values).sum())
+        costs = (squares - 2 * positions * total + n * positions * positions + costs) // 2
+    return positions, costs
+
+
+def get_min_position_and_cost(values: List[int], triangle: bool = False) -> Tuple[int, int]:
+    """Fast version of get_min_position_and_distance for linear or triangle number costs."""
+    positions, costs = get_all_costs(values, triangle=triangle)
+    i = int(np.argmin(costs))
+    return int(positions[i]), int(costs[i])
+
+
+def get_min_position_convex(
+        values: List[int],
+        distance_function: Callable,
+        vectorized: bool = True,
+) -> Tuple[int, int]:
+    """
+    Find the best position for any convex distance_function(crab_position, position),
+    like the linear and triangle number distances. The total cost is then convex too, so
+    the change in cost from p to p + 1 never decreases as p grows, and the best position
+    is the first one where that change isn't negative. Binary search for it needs
+    O(log range) total cost evaluations instead of one per position.
+
+    With vectorized=True, distance_function is called once per evaluation with the
+    whole array of crab positions (it needs to work on NumPy arrays, which plain
+    arithmetic and abs() do).
+    """
+    values = np.asarray(values, dtype=np.int64)
+
+    def total_cost(p: int) -> int:
+        if vectorized:
+            return int(np.sum(distance_function(values, p)))
+        return sum(distance_function(int(x), p) for x in values)
+
+    low, high = int(values.min()), int(values.max())
+    while low < high:
+        mid = (low + high) // 2
+        if total_cost(mid + 1) - total_cost(mid) >= 0:
+            high = mid
+        else:
+            low = mid + 1
+    return low, total_cost(low)
+
+
+def part_1(data: List[int]) -> int:
+    x, dist = get_min_position_and_cost(data)
+    return dist
+
+
+def part_2(data: List[int]) -> int:
+    x, dist = get_min_position_and_cost(data, triangle=True)
+    return dist
 
 
 if __name__ == "__main__":
     data = parse_data("data/07.txt")
 
     ### Part 1
-    x, dist = get_min_position_and_distance(data)
-    print(f"solution 07a: {dist}")
+    print(f"solution 07a: {part_1(data)}")
 
     ### Part 2
-    x, dist = get_min_position_and_distance(data, distance_function=triangle_number_distance)
-    print(f"solution 07b: {dist}")
+    print(f"solution 07b: {part_2(data)}")
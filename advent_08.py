@@ -1,11 +1,14 @@
 """
-This one isn't particularly optimized and I'm basically doing part 2 by brute force.
-It's the slowest running solution so far. (It still runs in less han a second on my
-machine -- 2020 MacBook Air).
+My first version of part 2 was brute force: try every LetterMap until one works. That
+was the slowest running solution so far. (It still runs in less han a second on my
+machine -- 2020 MacBook Air). Part 2 now uses decode_line, which identifies each digit
+directly from how often its segments appear in the ten patterns.
 """
 
 from shared import read_text_file
-from typing import List, Tuple, Generator, Set
+from collections import Counter
+from functools import cache
+from typing import List, Tuple, Generator, Set, Dict
 from itertools import permutations
 
 
@@ -23,6 +26,49 @@ DIGIT_MAP = [
 ]
 
 
+def get_segment_fingerprints() -> dict:
+    """
+    Count how many of the ten digits use each segment, then give each digit the sum of
+    those counts over its segments. The sums are different for every digit and they
+    don't depend on how the wires are mixed up, so they identify the digits.
+    """
+    segment_counts = Counter(x for digit in DIGIT_MAP for x in digit)
+    fingerprints = {sum(segment_counts[x] for x in digit): i for i, digit in enumerate(DIGIT_MAP)}
+    assert len(fingerprints) == len(DIGIT_MAP)
+    return fingerprints
+
+
+FINGERPRINTS = get_segment_fingerprints()
+
+# segments as bits: "a" is 1, "b" is 2, "c" is 4, etc.
+SEGMENT_BITS = {x: 1 << i for i, x in enumerate("abcdefg")}
+
+
+def to_mask(digit_string: str, letter_map: Dict[str, str] = None) -> int:
+    """Turn a string of segments into a 7-bit mask, optionally translating the letters first."""
+    if letter_map:
+        return sum(SEGMENT_BITS[letter_map[x]] for x in digit_string)
+    return sum(SEGMENT_BITS[x] for x in digit_string)
+
+
+DIGIT_MASKS = {to_mask("".join(x)): i for i, x in enumerate(DIGIT_MAP)}
+
+
+@cache
+def get_wiring_table() -> Dict[Tuple[int, ...], Dict[int, int]]:
+    """
+    For every possible wiring (permutation of the segments), the sorted masks of the ten
+    patterns we'd see, mapped to a dict that decodes each of those masks into its digit.
+    Built once, the first time it's needed.
+    """
+    table = {}
+    for order in permutations("abcdefg"):
+        wiring = dict(zip("abcdefg", order))  # real segment -> observed letter
+        decoder = {to_mask("".join(x), wiring): i for i, x in enumerate(DIGIT_MAP)}
+        table[tuple(sorted(decoder))] = decoder
+    return table
+
+
 def parse_data(path: str) -> Tuple[List[str], List[str]]:
     data = read_text_file(path, dtype=str)
     split_data = [x.split(" | ") for x in data]
@@ -56,14 +102,17 @@ class LetterMap:
     def map_digit_string(self, digit_string: str) -> Set[str]:
         return set(self.map[x] for x in digit_string)
 
+    def map_digit_string_to_mask(self, digit_string: str) -> int:
+        return to_mask(digit_string, self.map)
+
     def is_valid_for_digit_string(self, digit_string: str) -> bool:
-        return self.map_digit_string(digit_string) in DIGIT_MAP
+        return self.map_digit_string_to_mask(digit_string) in DIGIT_MASKS
 
     def is_valid_for_line(self, line: str) -> bool:
         return all(self.is_valid_for_digit_string(x) for x in line.split(" "))
 
     def evaluate_digit_string(self, digit_string: str) -> str:
-        return str(DIGIT_MAP.index(self.map_digit_string(digit_string)))
+        return str(DIGIT_MASKS[self.map_digit_string_to_mask(digit_string)])
 
     def evaluate_line(self, line: str) -> int:
         digit_strings = [x for x in line.split(" ")]
@@ -95,14 +144,41 @@ def evaluate_all_maps(maps: List[LetterMap], data: List[str]) -> int:
     return sum(m.evaluate_line(line) for m, line in zip(maps, data))
 
 
+def decode_line(patterns: str, output: str) -> int:
+    """
+    Decode the output digits using the ten unique patterns (one line of input) in
+    constant time, without searching for the letter map.
+    """
+    segment_counts = Counter(patterns.replace(" ", ""))
+    digits = [FINGERPRINTS[sum(segment_counts[x] for x in digit_string)] for digit_string in output.split(" ")]
+    return int("".join(str(x) for x in digits))
+
+
+def decode_all_lines(input: List[str], output: List[str]) -> int:
+    return sum(decode_line(patterns, x) for patterns, x in zip(input, output))
+
+
+def decode_line_with_table(patterns: str, output: str) -> int:
+    """Alternative to decode_line: find the wiring with one lookup in the wiring table."""
+    decoder = get_wiring_table()[tuple(sorted(to_mask(x) for x in patterns.split(" ")))]
+    return int("".join(str(decoder[to_mask(x)]) for x in output.split(" ")))
+
+
+def part_1(data: Tuple[List[str], List[str]]) -> int:
+    input, output = data
+    return count_easy_digits(output)
+
+
+def part_2(data: Tuple[List[str], List[str]]) -> int:
+    input, output = data
+    return decode_all_lines(input, output)
+
+
 if __name__ == "__main__":
-    input, output = parse_data("data/08.txt")
+    data = parse_data("data/08.txt")
 
     ### Part 1
-    n = count_easy_digits(output)
-    print(f"Solution 08a: {n}")
+    print(f"Solution 08a: {part_1(data)}")
 
     ### Part 2
-    maps = find_all_valid_maps(input)
-    solution = evaluate_all_maps(maps, output)
-    print(f"Solution 08b: {solution}")
+    print(f"Solution 08b: {part_2(data)}")
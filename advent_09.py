@@ -1,5 +1,13 @@
+import heapq
 from collections import defaultdict
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Dict
+import numpy as np
+
+
+# rows of the height map handled at once when joining basins, to bound temporary arrays
+BASIN_BLOCK_ROWS = 1024
+# rows of the height map read at once by the tiled solver
+BAND_ROWS = 512
 
 
 class LowPointMap:
@@ -82,22 +90,244 @@ class LowPointMap:
         return sorted(basin_sizes, reverse=True)[:n]
 
 
-def parse_data(path: str):
-    data = []
-    with open(path, "r") as f:
-        for line in f:
-            data.append([int(x) for x in line.strip()])
-    return data
+def parse_heightmap(path: str) -> np.ndarray:
+    """Read the height map into a 2D uint8 array (every line must be the same length)."""
+    with open(path, "rb") as f:
+        raw = f.read().rstrip()
+    n_cols = raw.index(b"\n") if b"\n" in raw else len(raw)
+    digits = np.frombuffer(raw + b"\n", dtype=np.uint8).reshape(-1, n_cols + 1)[:, :n_cols]
+    return digits - ord("0")
+
+
+def label_basins(heights: np.ndarray) -> np.ndarray:
+    """
+    Label the basins (areas bounded by 9s) with a vectorized union-find. Returns a flat
+    array with one entry per cell: the index of the basin's root cell, or -1 for 9s.
+
+    The union-find works on horizontal runs of basin cells rather than single cells, so
+    only the links between runs in neighboring rows are left to join. Each run only
+    needs one link to each run it touches, so the links are found once (a block of rows
+    at a time) and kept. Each round, for each link whose runs have different roots, the
+    larger root is pointed at the smaller one, and then the pointers are followed
+    (doubling each step) until every run points at a root. Links that already share a
+    root can never come apart, so they're dropped, and rounds repeat until no links are
+    left. Nothing is recursive and there's no per-cell Python work, so big maps are fine.
+    """
+    n_rows, n_cols = heights.shape
+    dtype = np.int32 if heights.size < 2 ** 31 else np.int64
+    in_basin = heights != 9
+    run_starts = in_basin.copy()
+    run_starts[:, 1:] &= ~in_basin[:, :-1]
+    runs = np.cumsum(run_starts, dtype=dtype).reshape(n_rows, n_cols) - 1  # run number of each cell
+    runs[~in_basin] = -1
+
+    # one link for each pair of touching runs in neighboring rows
+    links_above, links_below = [], []
+    for start in range(0, n_rows - 1, BASIN_BLOCK_ROWS):
+        stop = min(start + BASIN_BLOCK_ROWS, n_rows - 1)
+        above, below = runs[start:stop], runs[start + 1:stop + 1]
+        touching = in_basin[start:stop] & in_basin[start + 1:stop + 1]
+        is_new = touching.copy()  # skip a link if the cell to the left already links the same runs
+        is_new[:, 1:] &= ~(touching[:, :-1] & (above[:, 1:] == above[:, :-1]) & (below[:, 1:] == below[:, :-1]))
+        links_above.append(above[is_new])
+        links_below.append(below[is_new])
+    links_above = np.concatenate(links_above or [np.zeros(0, dtype=dtype)])
+    links_below = np.concatenate(links_below or [np.zeros(0, dtype=dtype)])
+
+    run_start_cells = np.flatnonzero(run_starts).astype(dtype)
+    parent = np.arange(len(run_start_cells), dtype=dtype)
+    while len(links_above):
+        root_above, root_below = parent[links_above], parent[links_below]
+        differ = root_above != root_below
+        links_above, links_below = links_above[differ], links_below[differ]
+        root_above, root_below = root_above[differ], root_below[differ]
+        parent[np.maximum(root_above, root_below)] = np.minimum(root_above, root_below)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    # runs are numbered in cell order, so the root run starts at the basin's first cell
+    if len(parent) == 0:
+        return runs.ravel()  # all 9s
+    labels = runs.ravel()
+    return np.where(labels >= 0, run_start_cells[parent[labels]], -1).astype(dtype, copy=False)  # 9s look up run -1, then get dropped
+
+
+def get_low_point_mask(heights: np.ndarray) -> np.ndarray:
+    """
+    Find the points that are lower than all of their neighbors by comparing the height
+    map with copies of itself shifted one step in each direction. The map is padded
+    with 9s so points on the edge don't need special treatment.
+    """
+    padded = np.pad(heights, 1, constant_values=9)
+    center = padded[1:-1, 1:-1]
+    return (
+        (center < padded[:-2, 1:-1])
+        & (center < padded[2:, 1:-1])
+        & (center < padded[1:-1, :-2])
+        & (center < padded[1:-1, 2:])
+    )
+
+
+def score_low_points(heights: np.ndarray, is_low: np.ndarray) -> int:
+    return int(heights[is_low].sum(dtype=np.int64)) + int(is_low.sum())
+
+
+def find_low_points_vectorized(heights: np.ndarray) -> Tuple[int, np.ndarray]:
+    """Return the risk score and an (n, 2) array of the (i, j) coordinates of the low points."""
+    is_low = get_low_point_mask(heights)
+    return score_low_points(heights, is_low), np.argwhere(is_low)
+
+
+def get_basin_sizes(labels: np.ndarray) -> np.ndarray:
+    """Size of every basin (indexed by root cell -- non-roots have size 0)."""
+    return np.bincount(labels[labels >= 0])
+
+
+def find_largest_basins_fast(heights: np.ndarray, n: int = 3, low_points: np.ndarray = None) -> List[int]:
+    """
+    Sizes of the n largest basins. If the low point coordinates are given, only basins
+    containing a low point are counted (every basin has one on real inputs).
+    """
+    labels = label_basins(heights)
+    sizes = get_basin_sizes(labels)
+    if low_points is None:
+        sizes = sizes[sizes > 0]
+    else:
+        sizes = sizes[np.unique(labels[np.ravel_multi_index(tuple(low_points.T), heights.shape)])]
+    if len(sizes) > n:
+        sizes = np.partition(sizes, -n)[-n:]
+    return sorted(sizes.tolist(), reverse=True)
+
+
+class MergeTable:
+    """Union-find over basin labels that meet across the boundary between two bands."""
+    def __init__(self):
+        self.parent: Dict[int, int] = dict()
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+
+def open_heightmap(path: str) -> Tuple[np.memmap, int, int]:
+    """Memory map a height map file. Returns the raw bytes, the number of rows and the row length."""
+    with open(path, "rb") as f:
+        n_cols = len(f.readline().rstrip(b"\n"))
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    return raw, (len(raw) + 1) // (n_cols + 1), n_cols  # the last line might not end in a newline
+
+
+def read_band(raw: np.memmap, n_cols: int, start: int, stop: int) -> np.ndarray:
+    """Copy rows start to stop out of a memory mapped height map."""
+    band = np.asarray(raw[start * (n_cols + 1):stop * (n_cols + 1)])
+    if len(band) < (stop - start) * (n_cols + 1):
+        band = np.append(band, np.uint8(ord("\n")))
+    return band.reshape(-1, n_cols + 1)[:, :n_cols] - ord("0")
+
+
+def solve_tiled(path: str, n: int = 3, band_rows: int = BAND_ROWS) -> Tuple[int, List[int]]:
+    """
+    Find the risk score and the n largest basin sizes without loading the whole height
+    map. The file is memory mapped and read in bands of rows, so memory use depends on
+    the width of the map and band_rows, not on the number of rows.
+
+    Low points are found one band at a time, with one extra row above and below so the
+    points on the edge of the band can be compared with their neighbors. Basins are
+    labeled within each band, and basins that touch the bottom row stay "open" -- their
+    labels along that row and their sizes so far are carried to the next band, where a
+    merge table joins them with the basins they meet in its top row. A basin that can't
+    grow any more is closed and only its size is kept, if it's among the n largest.
+    """
+    raw, n_rows, n_cols = open_heightmap(path)
+    risk_score = 0
+    largest: List[int] = []
+    open_labels = np.full(n_cols, -1, dtype=np.int64)  # basin labels along the bottom row of the last band
+    open_sizes: Dict[int, int] = dict()
+
+    for start in range(0, n_rows, band_rows):
+        stop = min(start + band_rows, n_rows)
+        halo_start, halo_stop = max(start - 1, 0), min(stop + 1, n_rows)
+        with_halo = read_band(raw, n_cols, halo_start, halo_stop)
+        band = with_halo[start - halo_start:stop - halo_start]
+        risk_score += score_low_points(band, get_low_point_mask(with_halo)[start - halo_start:stop - halo_start])
+
+        # label the band on its own, using the index of each root cell in the whole map
+        offset = start * n_cols
+        local_labels = label_basins(band)
+        local_sizes = get_basin_sizes(local_labels)
+        labels = np.where(local_labels >= 0, local_labels.astype(np.int64) + offset, -1).reshape(band.shape)
+
+        # join the open basins from above with the basins they touch in the top row
+        table = MergeTable()
+        touching = (open_labels >= 0) & (labels[0] >= 0)
+        for a, b in np.unique(np.stack([open_labels[touching], labels[0][touching]], axis=1), axis=0).tolist():
+            table.union(a, b)
+        group_sizes = defaultdict(int)
+        for x in list(table.parent):
+            group_sizes[table.find(x)] += open_sizes[x] if x < offset else int(local_sizes[x - offset])
+            if x >= offset:
+                local_sizes[x - offset] = 0  # counted in the group instead
+        closed = [size for x, size in open_sizes.items() if x not in table.parent]
+
+        # point the bottom row at the group each basin belongs to
+        bottom = labels[-1].copy()
+        if table.parent:
+            members = np.array(sorted(table.parent), dtype=np.int64)
+            roots = np.array([table.find(x) for x in members.tolist()], dtype=np.int64)
+            position = np.searchsorted(members, bottom).clip(max=len(members) - 1)
+            is_member = members[position] == bottom
+            bottom[is_member] = roots[position[is_member]]
+        still_open = np.unique(bottom[bottom >= 0]).tolist() if stop < n_rows else []
+
+        new_open_sizes = dict()
+        for x in still_open:
+            new_open_sizes[x] = group_sizes[x] if x in group_sizes else int(local_sizes[x - offset])
+            if x >= offset:
+                local_sizes[x - offset] = 0
+        closed.extend(size for x, size in group_sizes.items() if x not in new_open_sizes)
+        closed_local = local_sizes[local_sizes > 0]
+        if len(closed_local) > n:
+            closed_local = np.partition(closed_local, -n)[-n:]
+        largest = heapq.nlargest(n, largest + closed + closed_local.tolist())
+
+        open_labels = bottom if stop < n_rows else np.full(n_cols, -1, dtype=np.int64)
+        open_sizes = new_open_sizes
+
+    return risk_score, largest
+
+
+def parse_data(path: str) -> np.ndarray:
+    return parse_heightmap(path)
+
+
+def part_1(data: np.ndarray) -> int:
+    risk_score, _ = find_low_points_vectorized(data)
+    return risk_score
+
+
+def part_2(data: np.ndarray) -> int:
+    _, low_points = find_low_points_vectorized(data)
+    largest_basins = find_largest_basins_fast(data, low_points=low_points)
+    return largest_basins[0] * largest_basins[1] * largest_basins[2]
 
 
 if __name__ == "__main__":
     data = parse_data("data/09.txt")
-    low_point_map = LowPointMap(data)
 
     ### Part 1
-    score = low_point_map.score_low_points()
-    print(f"Solution 09a: {score}")
+    print(f"Solution 09a: {part_1(data)}")
 
     ### Part 2
-    largest_basins = low_point_map.find_largest_basins()
-    print(f"Solution 09b: {largest_basins[0] * largest_basins[1] * largest_basins[2]}")
+    print(f"Solution 09b: {part_2(data)}")
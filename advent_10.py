@@ -1,5 +1,9 @@
-from shared import read_text_file
-from typing import List, Any
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from shared import read_text_file, iter_text_file
+from typing import List, Any, Tuple, Union
+import numpy as np
 
 
 START_BRACKETS = ["(", "[", "{", "<"]
@@ -8,6 +12,12 @@ BRACKET_DICT = dict(zip(START_BRACKETS, END_BRACKETS))
 CORRUPT_SCORE_DICT = {")": 3, "]": 57, "}": 1197, ">": 25137}
 INCOMPLETE_SCORE_DICT = {")": 1, "]": 2, "}": 3, ">": 4}
 
+# opening brackets translate to 0-3 and closing brackets to 4-7, so a closing bracket
+# matches an opening one if its code is 4 more
+BRACKET_TABLE = bytes.maketrans("".join(START_BRACKETS + END_BRACKETS).encode(), bytes(range(8)))
+# files bigger than this are split between worker processes by scan_file
+MIN_SHARD_BYTES = 1 << 22
+
 
 def parse_data(path: str) -> List[str]:
     return read_text_file(path)
@@ -66,19 +76,139 @@ def score_completing_characters(chars: List[str]) -> List[int]:
 
 
 def get_middle_item(x: list) -> Any:
-    return sorted(x)[len(x) // 2]
+    """
+    Return the item that would be in the middle of x if it was sorted, without sorting
+    it. Completion scores for very long lines don't fit in int64, in which case the
+    selection is done on an array of Python ints instead.
+    """
+    try:
+        values = np.array(x, dtype=np.int64)
+    except OverflowError:
+        values = np.array(x, dtype=object)
+    middle = len(values) // 2
+    selected = np.partition(values, middle)[middle]
+    return selected.item() if isinstance(selected, np.generic) else selected
+
+
+class RunningMedian:
+    """
+    Keep track of the middle item (as in get_middle_item) of values that arrive one at a
+    time. The lower half is kept in a max heap and the upper half in a min heap, with
+    the upper half holding the extra item when there's an odd number.
+    """
+    def __init__(self):
+        self.lower = []  # negated, so the largest is at the top
+        self.upper = []
+
+    def __len__(self) -> int:
+        return len(self.lower) + len(self.upper)
+
+    def add(self, x: int):
+        if self.upper and x < self.upper[0]:
+            x = -heapq.heappushpop(self.lower, -x)
+        heapq.heappush(self.upper, x)
+        if len(self.upper) > len(self.lower) + 1:
+            heapq.heappush(self.lower, -heapq.heappop(self.upper))
+
+    @property
+    def median(self) -> int:
+        return self.upper[0]
+
+
+def scan_line(line: str) -> Union[str, int]:
+    """
+    Check a line in one pass. Return the first corrupt character if there is one,
+    otherwise the score of the characters that would complete the line.
+    """
+    open_brackets = []
+    for code in line.encode().translate(BRACKET_TABLE):
+        if code < 4:
+            open_brackets.append(code)
+        elif not open_brackets or open_brackets.pop() != code - 4:
+            return END_BRACKETS[code - 4]
+    score = 0
+    for code in reversed(open_brackets):
+        score = score * 5 + code + 1
+    return score
+
+
+def scan_lines(lines: List[str]) -> Tuple[int, List[int]]:
+    """Return the total score of the corrupt characters and the completion score of each incomplete line."""
+    corrupt_score = 0
+    completion_scores = []
+    for line in lines:
+        result = scan_line(line)
+        if isinstance(result, str):
+            corrupt_score += CORRUPT_SCORE_DICT[result]
+        else:
+            completion_scores.append(result)
+    return corrupt_score, completion_scores
+
+
+def scan_file_range(path: str, start: int, stop: int) -> Tuple[int, List[int]]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        lines = f.read(stop - start).decode().splitlines()
+    return scan_lines([x for x in lines if x])
+
+
+def split_file(path: str, n: int) -> List[Tuple[int, int]]:
+    """Split a file into about n byte ranges that start and end on line boundaries."""
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as f:
+        for i in range(1, n):
+            f.seek(max(size * i // n, boundaries[-1]))
+            f.readline()  # move to the start of the next line
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [(a, b) for a, b in zip(boundaries, boundaries[1:]) if b > a]
+
+
+def scan_file(path: str, n_jobs: int = None) -> Tuple[int, List[int]]:
+    """
+    Like scan_lines, but read the lines straight from a file. Big files are split into
+    shards that are scanned in parallel, and the results are combined in file order.
+    """
+    n_shards = min((n_jobs or os.cpu_count() or 1) * 4, os.path.getsize(path) // MIN_SHARD_BYTES)
+    if n_shards <= 1:
+        return scan_file_range(path, 0, os.path.getsize(path))
+    ranges = split_file(path, n_shards)
+    corrupt_score = 0
+    completion_scores = []
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        for shard_corrupt_score, shard_completion_scores in executor.map(
+                scan_file_range, [path] * len(ranges), *zip(*ranges)):
+            corrupt_score += shard_corrupt_score
+            completion_scores.extend(shard_completion_scores)
+    return corrupt_score, completion_scores
+
+
+def get_median_completion_score_streaming(path: str) -> int:
+    """Scan the lines of a file one at a time, keeping only the running median of the completion scores."""
+    running_median = RunningMedian()
+    for line in iter_text_file(path):
+        result = scan_line(line)
+        if not isinstance(result, str):
+            running_median.add(result)
+    return running_median.median
+
+
+def part_1(data: List[str]) -> int:
+    corrupt_score, _ = scan_lines(data)
+    return corrupt_score
+
+
+def part_2(data: List[str]) -> int:
+    _, completion_scores = scan_lines(data)
+    return get_middle_item(completion_scores)
 
 
 if __name__ == "__main__":
-    data = read_text_file("data/10.txt")
+    data = parse_data("data/10.txt")
 
     ### Part 1
-    chars = find_corrupting_characters(data)
-    score = score_corrupting_characters(chars)
-    print(f"Solution 10a: {score}")
+    print(f"Solution 10a: {part_1(data)}")
 
     ### Part 2
-    chars = get_completing_characters(data)
-    scores = score_completing_characters(chars)
-    middle_score = get_middle_item(scores)
-    print(f"Solution 10b: {middle_score}")
+    print(f"Solution 10b: {part_2(data)}")
@@ -93,15 +93,22 @@ class Grid:
         return f"Grid({out}\n)"
 
 
+def part_1(data: List[List[int]]) -> int:
+    grid = Grid(data)
+    grid.advance_n_steps(100)
+    return grid.flash_count
+
+
+def part_2(data: List[List[int]]) -> int:
+    grid = Grid(data)
+    return grid.find_first_all_flash()
+
+
 if __name__ == "__main__":
     data = parse_data("data/11.txt")
 
     ### Part 1
-    grid = Grid(data)
-    grid.advance_n_steps(100)
-    print(f"Solution 11a: {grid.flash_count}")
+    print(f"Solution 11a: {part_1(data)}")
 
     ### Part 2
-    grid = Grid(data)
-    solution = grid.find_first_all_flash()
-    print(f"Solution 11b: {solution}")
+    print(f"Solution 11b: {part_2(data)}")
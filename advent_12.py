@@ -69,14 +69,23 @@ class CaveGraph:
                 )
 
 
+def part_1(data: List[str]) -> int:
+    graph = CaveGraph(data)
+    graph.trace_paths()
+    return len(graph.paths)
+
+
+def part_2(data: List[str]) -> int:
+    graph = CaveGraph(data)
+    graph.trace_paths_2()
+    return len(graph.paths_2)
+
+
 if __name__ == "__main__":
     data = parse_data("data/12.txt")
 
     ### Part 1
-    graph = CaveGraph(data)
-    graph.trace_paths()
-    print(f"Solution 12a: {len(graph.paths)}")
+    print(f"Solution 12a: {part_1(data)}")
 
     ### Part 2
-    graph.trace_paths_2()
-    print(f"Solution 12b: {len(graph.paths_2)}")
+    print(f"Solution 12b: {part_2(data)}")
@@ -33,20 +33,21 @@ class Grid:
         for fold in folds:
             self.fold(fold)
 
-    def print_marked_points(self, file_path: str = None):
+    def render_marked_points(self) -> str:
+        """Draw the marked points as lines of "#" and " " (the lines are joined with newlines)."""
         max_x = max(p.x for p in self.marked_points)
         max_y = max(p.y for p in self.marked_points)
         out = [[" " for _ in range(max_x + 1)] for _ in range(max_y + 1)]
         for p in self.marked_points:
             out[p.y][p.x] = "#"
+        return "\n".join("".join(line) for line in out)
 
+    def print_marked_points(self, file_path: str = None):
         if file_path:
             with open(file_path, "w") as f:
-                for line in out:
-                    f.write("".join(line) + "\n")
+                f.write(self.render_marked_points() + "\n")
         else:
-            for line in out:
-                print("".join(line))
+            print(self.render_marked_points())
 
 
 def parse_data(path: str) -> Tuple[List[Point], List[Fold]]:
@@ -67,14 +68,27 @@ def parse_data(path: str) -> Tuple[List[Point], List[Fold]]:
     return points, folds
 
 
+def part_1(data: Tuple[List[Point], List[Fold]]) -> int:
+    points, folds = data
+    grid = Grid(points)
+    grid.fold(folds[0])
+    return len(grid.marked_points)
+
+
+def part_2(data: Tuple[List[Point], List[Fold]]) -> str:
+    """The answer is a code drawn by the points, so return the drawing."""
+    points, folds = data
+    grid = Grid(points)
+    grid.process_multiple_folds(folds)
+    return grid.render_marked_points()
+
+
 if __name__ == "__main__":
-    points, folds = parse_data("data/13.txt")
+    data = parse_data("data/13.txt")
 
     ### Part 1
-    grid = Grid(points)
-    grid.fold(folds[0])
-    print(f"Solution 13a: {len(grid.marked_points)}")
+    print(f"Solution 13a: {part_1(data)}")
 
     ### Part 2
-    grid.process_multiple_folds(folds[1:])
-    grid.print_marked_points("data/13.out")  # view this file to get the code
+    with open("data/13.out", "w") as f:
+        f.write(part_2(data) + "\n")  # view this file to get the code
@@ -49,18 +49,25 @@ def pair_counts_to_letter_counts(pair_counts: Counter[str, int]) -> Counter[str,
     return letter_counts
 
 
-if __name__ == "__main__":
-    template, rules = parse_data("data/14.txt")
-
-    ### Part 1
+def part_1(data: Tuple[str, Dict[str, str]]) -> int:
+    template, rules = data
     pair_counts = process_rules_n_times(template, rules, 10)
     letter_counts = pair_counts_to_letter_counts(pair_counts)
-    solution = max(letter_counts.values()) - min(letter_counts.values())
-    print(f"Solution 14a: {solution}")
+    return max(letter_counts.values()) - min(letter_counts.values())
 
-    ### Part 2
+
+def part_2(data: Tuple[str, Dict[str, str]]) -> int:
+    template, rules = data
     pair_counts = process_rules_n_times(template, rules, 40)
     letter_counts = pair_counts_to_letter_counts(pair_counts)
-    solution = max(letter_counts.values()) - min(letter_counts.values())
-    print(f"Solution 14b: {solution}")
+    return max(letter_counts.values()) - min(letter_counts.values())
+
 
+if __name__ == "__main__":
+    data = parse_data("data/14.txt")
+
+    ### Part 1
+    print(f"Solution 14a: {part_1(data)}")
+
+    ### Part 2
+    print(f"Solution 14b: {part_2(data)}")
@@ -4,7 +4,7 @@ Runs in less than a second for a 500x500 grid.
 https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm
 """
 
-from shared import read_text_file
+from shared import read_text_file, COUNTERS_ENABLED, count
 from collections import defaultdict
 from functools import reduce
 from math import inf
@@ -68,10 +68,16 @@ class Grid:
         while heap:
             # take the first point in the queue, which will be the one with the shortest distance to it
             _, current_node = heapq.heappop(heap)
+            if COUNTERS_ENABLED:
+                count("heap_pops")
             if current_node in visited:
+                if COUNTERS_ENABLED:
+                    count("stale_heap_entries")
                 continue
             visited.add(current_node)
             distance = self.distances[current_node]
+            if COUNTERS_ENABLED:
+                count("nodes_expanded")
 
             # if we've reached the destination, we're done
             if current_node == self.destination and early_stopping:
@@ -86,20 +92,28 @@ class Grid:
                 if new_distance < self.distances[(next_i, next_j)]:
                     self.distances[(next_i, next_j)] = new_distance
                     heapq.heappush(heap, (new_distance, (next_i, next_j)))
+                    if COUNTERS_ENABLED:
+                        count("heap_pushes")
 
         return self.distances[self.destination]
 
 
+def part_1(data: List[List[int]]) -> int:
+    grid = Grid(data)
+    return grid.dijkstra()
+
+
+def part_2(data: List[List[int]]) -> int:
+    expanded_data = expand_data(data)
+    expanded_grid = Grid(expanded_data)
+    return expanded_grid.dijkstra()
+
+
 if __name__ == "__main__":
     data = parse_data("data/15.txt")
 
     ### Part 1
-    grid = Grid(data)
-    solution = grid.dijkstra()
-    print(f"Solution 15a: {solution}")
+    print(f"Solution 15a: {part_1(data)}")
 
     ### Part 2
-    expanded_data = expand_data(data)
-    expanded_grid = Grid(expanded_data)
-    solution = expanded_grid.dijkstra()
-    print(f"Solution 15b: {solution}")
+    print(f"Solution 15b: {part_2(data)}")
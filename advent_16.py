@@ -145,14 +145,21 @@ def get_packet_from_string(s: str) -> Packet:
     return Packet(s)
 
 
+def part_1(data: str) -> int:
+    packet = get_packet_from_string(data)
+    return packet.sum_versions()
+
+
+def part_2(data: str) -> int:
+    packet = get_packet_from_string(data)
+    return packet.get_packet_value()
+
+
 if __name__ == "__main__":
     data = parse_data("data/16.txt")
 
     ### Part 1
-    packet = get_packet_from_string(data)
-    version_sum = packet.sum_versions()
-    print(f"Solution 16a: {version_sum}")
+    print(f"Solution 16a: {part_1(data)}")
 
     ### Part 2
-    packet_value = packet.get_packet_value()
-    print(f"Solution 16b: {packet_value}")
+    print(f"Solution 16b: {part_2(data)}")
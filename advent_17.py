@@ -80,13 +80,19 @@ def parse_data(path: str) -> Target:
     return Target(int(xmin), int(xmax), int(ymin), int(ymax))
 
 
+def part_1(data: Target) -> int:
+    return data.find_max_height()
+
+
+def part_2(data: Target) -> int:
+    return len(data.find_solutions())
+
+
 if __name__ == "__main__":
-    target = parse_data("data/17.txt")
-    # target = parse_data("tests/data/17.txt")
+    data = parse_data("data/17.txt")
 
     ### Part 1
-    max_height = target.find_max_height()
-    print(f"Solution 1: {max_height}")
+    print(f"Solution 1: {part_1(data)}")
 
     ### Part 2
-    print(f"Solution 2: {len(target.find_solutions())}")
+    print(f"Solution 2: {part_2(data)}")
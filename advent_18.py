@@ -188,14 +188,21 @@ def parse_data(path: str) -> List[Number]:
     return data
 
 
+def part_1(data: List[Number]) -> int:
+    n = sum_numbers(data)
+    return get_magnitude(n)
+
+
+def part_2(data: List[Number]) -> int:
+    magnitudes = get_pairwise_magnitudes(data)
+    return max(magnitudes)
+
+
 if __name__ == "__main__":
     data = parse_data("data/18.txt")
 
     ### Part 1
-    n = sum_numbers(data)
-    magnitude = get_magnitude(n)
-    print(f"Solution 18a: {magnitude}")
+    print(f"Solution 18a: {part_1(data)}")
 
     ### Part 2
-    magnitudes = get_pairwise_magnitudes(data)
-    print(f"Solution 18b: {max(magnitudes)}")
+    print(f"Solution 18b: {part_2(data)}")
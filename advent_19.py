@@ -8,6 +8,7 @@ from __future__ import annotations
 from shared import read_text_file
 from typing import List, Tuple
 from itertools import combinations
+from copy import deepcopy
 import numpy as np
 from numpy.linalg import matrix_power
 
@@ -189,12 +190,33 @@ def parse_data(path: str) -> List[Scanner]:
     return [Scanner(beacon_data=x, id_=i) for i, x in enumerate(scanner_list)]
 
 
+# the last input that was aligned and the result, so part 2 can reuse the work from part 1
+_ALIGNED: Tuple[List[Scanner], Scanner] = (None, None)
+
+
+def get_aligned_scanners(data: List[Scanner]) -> Scanner:
+    """Align the scanners in the parsed input, reusing the result if this input was just aligned."""
+    global _ALIGNED
+    if _ALIGNED[0] is not data:
+        _ALIGNED = (data, align_scanners(deepcopy(data)))  # align_scanners consumes the list, so work on a copy
+    return _ALIGNED[1]
+
+
+def part_1(data: List[Scanner]) -> int:
+    s = get_aligned_scanners(data)
+    return len(s)
+
+
+def part_2(data: List[Scanner]) -> int:
+    s = get_aligned_scanners(data)
+    return int(s.scanner_manhattan_distances().max())
+
+
 if __name__ == "__main__":
     data = parse_data("data/19.txt")
 
     ### Part 1
-    s = align_scanners(data)
-    print(f"Solution 19a: {len(s)}")
+    print(f"Solution 19a: {part_1(data)}")
 
     ### Part 2
-    print(f"Solution 19b: {int(s.scanner_manhattan_distances().max())}")
+    print(f"Solution 19b: {part_2(data)}")
@@ -67,14 +67,23 @@ def parse_data(path: str) -> Image:
     return Image(image, algorithm)
 
 
+def part_1(data: Image) -> int:
+    image = deepcopy(data)  # enhancing modifies the image in place
+    image.multi_enhance(2)
+    return image.count_lit_pixels()
+
+
+def part_2(data: Image) -> int:
+    image = deepcopy(data)
+    image.multi_enhance(50)
+    return image.count_lit_pixels()
+
+
 if __name__ == "__main__":
-    image = parse_data("data/20.txt")
+    data = parse_data("data/20.txt")
 
     ### Part 1
-    image.multi_enhance(2)
-    print(f"Solution 20a: {image.count_lit_pixels()}")
+    print(f"Solution 20a: {part_1(data)}")
 
     ### Part 2
-    image = parse_data("data/20.txt")
-    image.multi_enhance(50)
-    print(f"Solution 20b: {image.count_lit_pixels()}")
+    print(f"Solution 20b: {part_2(data)}")
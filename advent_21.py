@@ -87,14 +87,24 @@ def parse_data(path: str) -> Tuple[int, int]:
     return p1, p2
 
 
+def part_1(data: Tuple[int, int]) -> int:
+    p1, p2 = data
+    game = Game(p1, p2)
+    game.play()
+    return min(game.scores) * game.die.n_rolls
+
+
+def part_2(data: Tuple[int, int]) -> int:
+    p1, p2 = data
+    counts = get_win_counts(p1, p2)
+    return max(counts)
+
+
 if __name__ == "__main__":
-    p1, p2 = parse_data("data/21.txt")
+    data = parse_data("data/21.txt")
 
     ### Part 1
-    game = Game(p1, p2)
-    game.play()
-    print(f"Solution 21a: {min(game.scores) * game.die.n_rolls}")
+    print(f"Solution 21a: {part_1(data)}")
 
     ### Part 2
-    counts = get_win_counts(p1, p2)
-    print(f"Solution 21b: {max(counts)}")
+    print(f"Solution 21b: {part_2(data)}")
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from shared import read_text_file
+from shared import read_text_file, COUNTERS_ENABLED, count, count_max
 from typing import List
 
 
@@ -42,14 +42,19 @@ class Cuboid:
         zrange = range(max(self.zrange[0], other.zrange[0]), min(self.zrange[-1], other.zrange[-1]) + 1)
         return Cuboid(xrange, yrange, zrange)
 
-    def nonoverlapping_volume(self, others: List[Cuboid]) -> int:
+    def nonoverlapping_volume(self, others: List[Cuboid], _depth: int = 1) -> int:
         """Find the volume of this cuboid that *doesn't* overlap with any other cuboids."""
         volume = self.volume()
         overlap_regions = [self.overlap_region(x) for x in others]
         # filter out regions with no overlap -- performance is much worse if we include these
         overlap_regions = [x for x in overlap_regions if x.volume() > 0]
+        if COUNTERS_ENABLED:
+            count("nonoverlapping_volume_calls")
+            count("overlap_regions_checked", len(others))
+            count("overlap_regions_kept", len(overlap_regions))
+            count_max("max_recursion_depth", _depth)
         for i, x in enumerate(overlap_regions):
-            volume -= x.nonoverlapping_volume(overlap_regions[i+1:])
+            volume -= x.nonoverlapping_volume(overlap_regions[i+1:], _depth + 1)
         return volume
 
     def in_limited_range(self):
@@ -78,12 +83,19 @@ def parse_data(path: str) -> List[Instruction]:
     return [Instruction(x) for x in data]
 
 
+def part_1(data: List[Instruction]) -> int:
+    return count_cubes(data, limit_range=True)
+
+
+def part_2(data: List[Instruction]) -> int:
+    return count_cubes(data)
+
+
 if __name__ == "__main__":
     data = parse_data("data/22.txt")
 
     ### Part 1
-    out = count_cubes(data, limit_range=True)
-    print(f"Solution 22a: {out}")
+    print(f"Solution 22a: {part_1(data)}")
 
     ### Part 2
-    print(f"Solution 22b: {count_cubes(data)}")
+    print(f"Solution 22b: {part_2(data)}")
@@ -4,11 +4,12 @@ Part 1 runs in about 1.5 seconds, but Part 2 runs takes much longer -- about 12
 Not entirely sure why it's so much slower (maybe it's some of my lazy code).
 """
 
-from shared import read_text_file
+from shared import read_text_file, COUNTERS_ENABLED, count
 from typing import List, Tuple, Dict, Union, Any
 import heapq
 from math import inf
 from collections import defaultdict
+from copy import deepcopy
 
 
 """
@@ -122,11 +123,17 @@ class Burrow:
         while heap:
             # take the first point in the queue, which will be the one with the shortest distance to it
             _, state = heapq.heappop(heap)
+            if COUNTERS_ENABLED:
+                count("heap_pops")
             if state in visited:
+                if COUNTERS_ENABLED:
+                    count("stale_heap_entries")
                 continue
             visited.add(state)
             distance = self.distances[state]
             self.current_state = state
+            if COUNTERS_ENABLED:
+                count("states_expanded")
 
             # if we've reached the destination, we're done
             if early_stopping and self.current_state == self.destination:
@@ -136,11 +143,15 @@ class Burrow:
             for d, next_state in self.get_possible_next_states():
                 next_state = tuple(sorted(next_state))  # order doesn't matter -- sort to avoid duplicate states
                 if next_state in visited:
+                    if COUNTERS_ENABLED:
+                        count("next_states_already_visited")
                     continue
                 new_distance = distance + d
                 if new_distance < self.distances[next_state]:
                     self.distances[next_state] = new_distance
                     heapq.heappush(heap, (new_distance, next_state))
+                    if COUNTERS_ENABLED:
+                        count("heap_pushes")
 
         return self.distances
 
@@ -235,6 +246,8 @@ class Burrow:
                     next_state = tuple_replace(self.current_state, i, f"{type_}{new_loc}")
                     next_states.append((distance, next_state))
 
+        if COUNTERS_ENABLED:
+            count("next_states_generated", len(next_states))
         return next_states
 
     def __repr__(self):
@@ -259,15 +272,24 @@ def parse_data(path: str) -> Burrow:
     return Burrow(state)
 
 
+def part_1(data: Burrow) -> int:
+    burrow = deepcopy(data)
+    d = burrow.dijkstra()
+    return d[SMALL_DESTINATION]
+
+
+def part_2(data: Burrow) -> int:
+    burrow = deepcopy(data)  # extend() modifies the burrow in place
+    burrow.extend()
+    d = burrow.dijkstra()
+    return d[LARGE_DESTINATION]
+
+
 if __name__ == "__main__":
-    burrow = parse_data("data/23.txt")
+    data = parse_data("data/23.txt")
 
     ### Part 1
-    d = burrow.dijkstra()
-    print(f"Solution 23a: {d[SMALL_DESTINATION]}")
+    print(f"Solution 23a: {part_1(data)}")
 
     ### Part 2
-    burrow = parse_data("data/23.txt")
-    burrow.extend()
-    d = burrow.dijkstra()
-    print(f"Solution 23b: {d[LARGE_DESTINATION]}")
+    print(f"Solution 23b: {part_2(data)}")
@@ -16,7 +16,7 @@ It might be faster to solve this one by studying the instructions and maybe even
 it out by hand... I didn't try that.
 """
 
-from shared import read_text_file
+from shared import read_text_file, COUNTERS_ENABLED, count
 from typing import List, Tuple
 from math import inf
 from collections import defaultdict
@@ -41,6 +41,8 @@ def solve(instructions: List[Tuple[str]], min_val: bool = False, prune_threshold
     else:
         def check(new: int, existing: int) -> bool:
             return new > existing
+    if COUNTERS_ENABLED:
+        cache_info = process_instruction.cache_info()
     states = {(0, 0, 0, 0): inf if min_val else 0}  # (w, x, y, z): max_input or min_input
     for i, inst in enumerate(split_instructions(instructions)):
         new_states = defaultdict(lambda: inf if min_val else 0)
@@ -51,8 +53,18 @@ def solve(instructions: List[Tuple[str]], min_val: bool = False, prune_threshold
                 if abs(new_state[3]) < prune_threshold:
                     if check(full_input, new_states[new_state]):
                         new_states[new_state] = full_input
+                elif COUNTERS_ENABLED:
+                    count("states_pruned")
+        if COUNTERS_ENABLED:
+            count("states_expanded", len(states))
+            count(f"states_after_input_{i + 1:02}", len(new_states))
         states = new_states
 
+    if COUNTERS_ENABLED:
+        new_cache_info = process_instruction.cache_info()
+        count("instruction_cache_hits", new_cache_info.hits - cache_info.hits)
+        count("instruction_cache_misses", new_cache_info.misses - cache_info.misses)
+
     solutions = {k: v for k, v in states.items() if k[3] == 0}
     if min_val:
         return min(solutions.values())
@@ -122,13 +134,19 @@ def parse_data(path: str) -> List[Tuple[str]]:
     return [tuple(x.split()) for x in data]
 
 
+def part_1(data: List[Tuple[str]]) -> int:
+    return solve(data, prune_threshold=1e6)
+
+
+def part_2(data: List[Tuple[str]]) -> int:
+    return solve(data, min_val=True, prune_threshold=1e6)
+
+
 if __name__ == "__main__":
     data = parse_data("data/24.txt")
 
     ### Part 1
-    solution = solve(data, prune_threshold=1e6)
-    print(f"Solution 24a: {solution}")
+    print(f"Solution 24a: {part_1(data)}")
 
     ### Part 2
-    solution = solve(data, min_val=True, prune_threshold=1e6)
-    print(f"Solution 24b: {solution}")
+    print(f"Solution 24b: {part_2(data)}")
@@ -42,10 +42,13 @@ def parse_data(path: str) -> List[List[str]]:
     return [list(x) for x in data]
 
 
+def part_1(data: List[List[str]]) -> int:
+    grid = Grid(data)
+    return grid.find_gridlock()
+
+
 if __name__ == "__main__":
     data = parse_data("data/25.txt")
 
     ### Part 1
-    grid = Grid(data)
-    solution = grid.find_gridlock()
-    print(f"Solution 25a: {solution}")
+    print(f"Solution 25a: {part_1(data)}")
@@ -0,0 +1,305 @@
+"""
+Benchmark parse_data, part_1 and part_2 for each day, on the real input and on
+synthetic inputs scaled up from it (e.g. 10x and 100x as many lines/rows). Each
+(day, scale) runs in its own process so slow or non-terminating cases can be cut off
+with a timeout. Results are appended to a JSON lines file and compared with the
+previous run so regressions stand out.
+
+Run from the repo root:
+    python benchmark.py                       # all scalable days at 1x, 10x, 100x
+    python benchmark.py 05 09 --scales 1 10   # just days 05 and 09
+    python benchmark.py --timeout 30 --repeat 3
+"""
+
+import argparse
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import re
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import List, Dict, Callable, Optional, Union
+
+from shared import read_text_file, cached_parse_data
+
+
+DEFAULT_RESULTS_PATH = "benchmark_results.jsonl"
+STEPS = ["parse", "a", "b"]
+# steps faster than this are too noisy to flag as slower, whatever the ratio
+MIN_FLAG_SECONDS = 0.005
+
+
+def repeat_lines(lines: List[str], n: int) -> List[str]:
+    """Repeat the whole file n times (works for inputs with one record per line)."""
+    return lines * n
+
+
+def repeat_comma_values(lines: List[str], n: int) -> List[str]:
+    """Repeat the values in a single comma separated line n times."""
+    return [",".join([lines[0]] * n)]
+
+
+def all_binary_numbers(lines: List[str], n: int) -> List[str]:
+    """
+    Every binary number of the smallest width that gives at least n times as many lines,
+    in a shuffled order. Repeated or random values can leave the day 3 rating filters
+    with nothing to choose between, but the full set always narrows down to one value.
+    """
+    width = math.ceil(math.log2(len(lines) * n))
+    out = [format(i, "b").zfill(width) for i in range(2 ** width)]
+    random.Random(0).shuffle(out)
+    return out
+
+
+def random_bingo_boards(lines: List[str], n: int) -> List[str]:
+    """Keep the draw order and generate n times as many random boards."""
+    n_boards = (len(lines) - 1) // 6
+    rng = random.Random(0)
+    out = lines[:1]
+    for _ in range(n_boards * n):
+        numbers = rng.sample(range(100), 25)
+        out.append("")
+        out.extend(" ".join(f"{x:>2}" for x in numbers[i:i + 5]) for i in range(0, 25, 5))
+    return out
+
+
+def tile_grid(lines: List[str], n: int) -> List[str]:
+    """
+    Tile a grid of digits k times in each direction, with k = ceil(sqrt(n)), so it
+    stays square and has at least n times as many cells.
+    """
+    k = math.ceil(math.sqrt(n))
+    return [x * k for x in lines] * k
+
+
+def offset_cuboids(lines: List[str], n: int) -> List[str]:
+    """
+    Repeat the reboot steps n times, moving each copy along x past the previous one.
+    Identical copies would overlap completely, which is a degenerate case for day 22.
+    The copies after the first are all outside the day 22 part 1 region.
+    """
+    numbers = [int(x) for x in re.findall(r"-?\d+", "\n".join(lines))]
+    span = max(numbers) - min(numbers) + 1
+    out = []
+    for i in range(n):
+        shift = lambda m: f"x={int(m.group(1)) + i * span}..{int(m.group(2)) + i * span}"
+        out.extend(re.sub(r"x=(-?\d+)\.\.(-?\d+)", shift, x) for x in lines)
+    return out
+
+
+def repeat_after_header(n_header_lines: int) -> Callable[[List[str], int], List[str]]:
+    """Keep the first few lines (e.g. the image algorithm) and repeat the rest n times."""
+    def scaler(lines: List[str], n: int) -> List[str]:
+        return lines[:n_header_lines] + lines[n_header_lines:] * n
+    return scaler
+
+
+def repeat_template(lines: List[str], n: int) -> List[str]:
+    """Repeat the polymer template n times and keep the rules."""
+    return [lines[0] * n] + lines[1:]
+
+
+# how to build an input n times bigger for each day -- days that don't scale in a
+# meaningful way (a single target, a fixed puzzle layout, etc.) only run at 1x
+SCALERS: Dict[str, Callable[[List[str], int], List[str]]] = {
+    "01": repeat_lines,
+    "02": repeat_lines,
+    "03": all_binary_numbers,
+    "04": random_bingo_boards,
+    "05": repeat_lines,
+    "06": repeat_comma_values,
+    "07": repeat_comma_values,
+    "08": repeat_lines,
+    "09": repeat_lines,  # stacks copies of the height map vertically
+    "10": repeat_lines,
+    "14": repeat_template,
+    "15": tile_grid,
+    "18": repeat_lines,
+    "20": repeat_after_header(2),
+    "22": offset_cuboids,
+    "25": repeat_lines,  # the sea floor wraps around, so stacked copies move in lockstep
+}
+
+
+def get_days() -> List[str]:
+    return sorted(x[7:9] for x in os.listdir(".") if x.startswith("advent_") and x.endswith(".py"))
+
+
+def write_scaled_input(day: str, scale: int, directory: str) -> str:
+    """Write an input for the day that is `scale` times bigger and return its path."""
+    path = f"data/{day}.txt"
+    if scale == 1:
+        return path
+    lines = read_text_file(path)
+    scaled_path = os.path.join(directory, f"{day}_x{scale}.txt")
+    with open(scaled_path, "w") as f:
+        f.write("\n".join(SCALERS[day](lines, scale)) + "\n")
+    return scaled_path
+
+
+def time_call(func: Callable, repeat: int, *args) -> float:
+    """Return the best wall time over `repeat` calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark_day(day: str, path: str, repeat: int, use_cache: bool, conn):
+    """
+    Time each step for one day, sending each result back as soon as it's known. A step
+    that raises is sent back as the exception's name instead of a time. With use_cache,
+    the parse step is timed loading from the parse cache.
+    """
+    module = importlib.import_module(f"advent_{day}")
+    parts = [(part, step) for part, step in [(1, "a"), (2, "b")] if hasattr(module, f"part_{part}")]
+    conn.send({"parse": None, **{step: None for _, step in parts}})  # the steps we expect to time
+
+    try:
+        if use_cache:
+            data = cached_parse_data(module, path)  # make sure the cache is populated before timing
+            conn.send({"parse": time_call(cached_parse_data, repeat, module, path)})
+        else:
+            conn.send({"parse": time_call(module.parse_data, repeat, path)})
+            data = module.parse_data(path)
+    except Exception as e:
+        conn.send({"parse": type(e).__name__})
+        return
+    for part, step in parts:
+        try:
+            conn.send({step: time_call(getattr(module, f"part_{part}"), repeat, data)})
+        except Exception as e:
+            conn.send({step: type(e).__name__})
+
+
+def run_benchmark(
+        day: str,
+        path: str,
+        repeat: int,
+        timeout: float,
+        use_cache: bool = False,
+) -> Dict[str, Union[float, str, None]]:
+    """
+    Run benchmark_day in a separate process. Steps that didn't finish before the
+    timeout are recorded as None, and steps that failed as the name of the error.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=benchmark_day, args=(day, path, repeat, use_cache, sender))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+
+    results = {}
+    while receiver.poll():
+        results.update(receiver.recv())
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_previous_run(results_path: str) -> Optional[dict]:
+    if not os.path.exists(results_path):
+        return None
+    with open(results_path, "r") as f:
+        lines = [x for x in f.read().splitlines() if x]
+    return json.loads(lines[-1]) if lines else None
+
+
+def format_seconds(x: Union[float, str, None]) -> str:
+    if x is None:
+        return "timeout"
+    elif isinstance(x, str):
+        return x[:10]  # name of the error
+    return f"{x:.4f}"
+
+
+def print_comparison(run: dict, previous: Optional[dict], threshold: float):
+    """
+    Print one row per (day, scale, step), flagging steps that got slower than threshold
+    (unless they take less than MIN_FLAG_SECONDS either way).
+    """
+    previous_results = {(x["day"], x["scale"]): x["seconds"] for x in (previous or {}).get("results", [])}
+    print(f"{'day':>3} {'scale':>5} {'step':>5} {'seconds':>10} {'previous':>10} {'ratio':>6}")
+    for result in run["results"]:
+        old = previous_results.get((result["day"], result["scale"]), {})
+        for step in STEPS:
+            if step not in result["seconds"] and step not in old:
+                continue  # e.g. day 25 part 2
+            new_seconds = result["seconds"].get(step)
+            old_seconds = old.get(step)
+            ratio, flag = "", ""
+            if isinstance(new_seconds, float) and isinstance(old_seconds, float) and old_seconds > 0:
+                ratio = f"{new_seconds / old_seconds:.2f}"
+                slower = new_seconds / old_seconds > threshold and max(new_seconds, old_seconds) >= MIN_FLAG_SECONDS
+                flag = "  <-- slower" if slower else ""
+            print(f"{result['day']:>3} {result['scale']:>5} {step:>5} {format_seconds(new_seconds):>10} "
+                  f"{format_seconds(old_seconds) if step in old else '':>10} {ratio:>6}{flag}")
+
+
+def main(
+        days: List[str],
+        scales: List[int],
+        repeat: int,
+        timeout: float,
+        results_path: str,
+        threshold: float,
+        use_cache: bool = False,
+):
+    run = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "cache": use_cache,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for day in days:
+            for scale in scales:
+                if scale != 1 and day not in SCALERS:
+                    continue
+                path = write_scaled_input(day, scale, directory)
+                seconds = run_benchmark(day, path, repeat=repeat, timeout=timeout, use_cache=use_cache)
+                run["results"].append({"day": day, "scale": scale, "seconds": seconds})
+
+    print_comparison(run, load_previous_run(results_path), threshold)
+    with open(results_path, "a") as f:
+        f.write(json.dumps(run) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Advent of Code solutions.")
+    parser.add_argument("days", nargs="*", help="days to benchmark, e.g. 01 15 (default: all)")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100], help="input size multipliers")
+    parser.add_argument("--repeat", type=int, default=1, help="report the best of this many runs per step")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per day and scale")
+    parser.add_argument("--results", default=DEFAULT_RESULTS_PATH, help="JSON lines file to append results to")
+    parser.add_argument("--threshold", type=float, default=1.2, help="flag steps slower than this ratio")
+    parser.add_argument("--cache", action="store_true", help="load parsed inputs from the parse cache")
+    args = parser.parse_args()
+
+    main(
+        days=[x.zfill(2) for x in args.days] or get_days(),
+        scales=args.scales,
+        repeat=args.repeat,
+        timeout=args.timeout,
+        results_path=args.results,
+        threshold=args.threshold,
+        use_cache=args.cache,
+    )
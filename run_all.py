@@ -0,0 +1,125 @@
+"""
+Run all of the solutions in parallel. Each day is imported and run in a worker process
+(parse_data, then part_1 and part_2), with the slowest days scheduled first so they
+don't hold up the end of the run. Solutions are printed in day order and the wall
+time for each step is written to a JSON file.
+
+Run from the repo root:
+    python run_all.py                 # all days
+    python run_all.py 15 23 -j 2      # just days 15 and 23, using two processes
+    AOC_COUNTERS=1 python run_all.py  # also record algorithm event counters per part
+"""
+
+import argparse
+import glob
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any
+
+from shared import cached_parse_data, COUNTERS_ENABLED, reset_counters, get_counters
+
+
+# rough runtimes in seconds, used to order the days when there are no previous results
+EXPECTED_SECONDS = {
+    "18": 30,
+    "23": 28,
+    "24": 27,
+    "19": 13,
+    "25": 2,
+    "20": 2,
+    "08": 2,
+}
+DEFAULT_JSON_PATH = "run_all.json"
+
+
+def get_days() -> List[str]:
+    return sorted(os.path.basename(x)[7:9] for x in glob.glob("advent_*.py"))
+
+
+def run_day(day: str, use_cache: bool = False) -> Dict[str, Any]:
+    """
+    Import the module for a day and time parse_data and each part. With use_cache, the
+    parsed data is loaded from the parse cache when possible. If AOC_COUNTERS is set,
+    the algorithm event counters for each part are included too.
+    """
+    module = importlib.import_module(f"advent_{day}")
+    result = {"day": day, "solutions": {}, "seconds": {}}
+
+    start = time.perf_counter()
+    path = f"data/{day}.txt"
+    data = cached_parse_data(module, path) if use_cache else module.parse_data(path)
+    result["seconds"]["parse"] = time.perf_counter() - start
+
+    for part, letter in [(1, "a"), (2, "b")]:
+        func = getattr(module, f"part_{part}", None)
+        if func is None:
+            continue  # e.g., day 25 only has one part
+        reset_counters()
+        start = time.perf_counter()
+        solution = func(data)
+        result["seconds"][letter] = time.perf_counter() - start
+        result["solutions"][letter] = str(solution)
+        if COUNTERS_ENABLED:
+            result.setdefault("counters", {})[letter] = get_counters()
+
+    result["seconds"]["total"] = sum(result["seconds"].values())
+    return result
+
+
+def order_longest_first(days: List[str], json_path: str = None) -> List[str]:
+    """Order days by expected runtime, using the previous run's timings if available."""
+    expected = dict(EXPECTED_SECONDS)
+    if json_path and os.path.exists(json_path):
+        with open(json_path, "r") as f:
+            previous = json.load(f)
+        expected.update({x["day"]: x["seconds"]["total"] for x in previous["days"] if "total" in x["seconds"]})
+    return sorted(days, key=lambda x: expected.get(x, 0), reverse=True)
+
+
+def run_all(
+        days: List[str],
+        n_jobs: int = None,
+        json_path: str = None,
+        use_cache: bool = False,
+) -> List[Dict[str, Any]]:
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {day: executor.submit(run_day, day, use_cache) for day in order_longest_first(days, json_path)}
+        results = []
+        for day in sorted(days):
+            try:
+                results.append(futures[day].result())
+            except Exception as e:
+                # record the error and keep going, so one broken day doesn't lose the others' results
+                results.append({"day": day, "solutions": {}, "seconds": {}, "error": type(e).__name__, "message": str(e)})
+
+    for result in results:
+        if "error" in result:
+            print(f"solution {result['day']}: failed with {result['error']}: {result['message']}")
+        for letter, solution in result["solutions"].items():
+            separator = "\n" if "\n" in solution else " "  # e.g. day 13 part 2 is a drawing, so start it on its own line
+            print(f"solution {result['day']}{letter}:{separator}{solution}")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"wall_seconds": time.perf_counter() - start, "days": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run all of the Advent of Code solutions.")
+    parser.add_argument("days", nargs="*", help="days to run, e.g. 01 15 (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--json", default=DEFAULT_JSON_PATH, help="where to write the timing results")
+    parser.add_argument("--cache", action="store_true", help="reuse parsed inputs from previous runs")
+    args = parser.parse_args()
+
+    run_all(
+        [x.zfill(2) for x in args.days] or get_days(),
+        n_jobs=args.jobs,
+        json_path=args.json,
+        use_cache=args.cache,
+    )
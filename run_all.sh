@@ -1,2 +1,2 @@
-# run all of the python scripts
-for f in advent_*.py; do python $f; done
+# run all of the python scripts (in parallel -- see run_all.py)
+python run_all.py "$@"
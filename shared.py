@@ -1,4 +1,151 @@
+import hashlib
+import inspect
+import mmap
+import os
+import pickle
+import time
+from array import array
+from collections import defaultdict
+from functools import cache
+from types import ModuleType
+from typing import Any, Dict, Generator
+
+
+CHUNK_SIZE = 1 << 20  # bytes read at a time by read_int_array
+PARSE_CACHE_DIR = ".parse_cache"
+# only cache parsed inputs that take at least this long to parse, and load at least
+# CACHE_MIN_SPEEDUP times faster than they parse
+CACHE_MIN_PARSE_SECONDS = 0.001
+CACHE_MIN_SPEEDUP = 2
+
+# set AOC_COUNTERS=1 to record algorithm events (heap pushes, states expanded, etc.)
+# call sites check COUNTERS_ENABLED first so the counters cost nothing when disabled
+COUNTERS_ENABLED = os.environ.get("AOC_COUNTERS", "") not in ("", "0")
+COUNTERS: Dict[str, int] = defaultdict(int)
+
+
 def read_text_file(path: str, dtype: type = str) -> list:
     with open(path, "r") as f:
         data = f.read().splitlines()
     return [dtype(x) for x in data]
+
+
+def iter_text_file(path: str, dtype: type = str) -> Generator:
+    """Like read_text_file, but yield one line at a time instead of building a list."""
+    with open(path, "r") as f:
+        for line in f:
+            yield dtype(line.rstrip("\r\n"))
+
+
+def iter_text_file_mmap(path: str, dtype: type = str) -> Generator:
+    """
+    Like iter_text_file, but read the lines from a memory map of the file so the OS
+    pages the data in (and out) as needed.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return  # can't memory map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for line in iter(m.readline, b""):
+                yield dtype(line.rstrip(b"\r\n").decode())
+
+
+def read_int_array(path: str, typecode: str = "q") -> array:
+    """
+    Read a file of integers -- one per line, comma separated, or a mix -- straight into
+    a compact array. The file is read in chunks so only the array itself grows with
+    the size of the input.
+    """
+    out = array(typecode)
+    leftover = b""
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            chunk = (leftover + chunk).replace(b",", b" ")
+            values = chunk.split()
+            # the last value might continue in the next chunk, unless the chunk ends in a separator
+            leftover = values.pop() if values and not chunk[-1:].isspace() else b""
+            out.extend(map(int, values))
+    if leftover:
+        out.append(int(leftover))
+    return out
+
+
+def file_hash(path: str) -> bytes:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            h.update(chunk)
+    return h.digest()
+
+
+@cache
+def source_hash(path: str) -> bytes:
+    """file_hash for source files, which only need to be hashed once per process."""
+    return file_hash(path)
+
+
+def cached_parse_data(module: ModuleType, path: str, cache_dir: str = PARSE_CACHE_DIR) -> Any:
+    """
+    Return module.parse_data(path), reusing a pickled copy from a previous call if there
+    is one. The cache key is a hash of the input file and the source of the module (and
+    this file), so editing either one means the input gets parsed again.
+
+    Some inputs are quicker to parse than to unpickle, or can't be pickled at all. For
+    those an empty marker file is written instead, and later calls just parse the input.
+    """
+    key = hashlib.sha256(module.__name__.encode())
+    key.update(file_hash(path))
+    key.update(source_hash(inspect.getsourcefile(module)))
+    key.update(source_hash(__file__))
+    cache_path = os.path.join(cache_dir, f"{module.__name__}-{key.hexdigest()[:16]}.pickle")
+    skip_path = cache_path[:-len(".pickle")] + ".skip"
+
+    if os.path.exists(skip_path):
+        return module.parse_data(path)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            pass  # unreadable cache file -- parse again and overwrite it
+
+    start = time.perf_counter()
+    data = module.parse_data(path)
+    parse_seconds = time.perf_counter() - start
+    worth_caching = parse_seconds >= CACHE_MIN_PARSE_SECONDS
+    if worth_caching:
+        try:
+            pickled = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            start = time.perf_counter()
+            pickle.loads(pickled)
+            worth_caching = (time.perf_counter() - start) * CACHE_MIN_SPEEDUP <= parse_seconds
+        except (pickle.PicklingError, AttributeError, TypeError):
+            worth_caching = False  # e.g. the data holds a lambda
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if not worth_caching:
+        open(skip_path, "wb").close()
+        return data
+    temp_path = f"{cache_path}.{os.getpid()}"  # write then rename so parallel runs never see half a file
+    with open(temp_path, "wb") as f:
+        f.write(pickled)
+    os.replace(temp_path, cache_path)
+    return data
+
+
+def count(event: str, n: int = 1):
+    COUNTERS[event] += n
+
+
+def count_max(event: str, value: int):
+    """Record the largest value seen for an event, e.g. recursion depth."""
+    if value > COUNTERS[event]:
+        COUNTERS[event] = value
+
+
+def reset_counters():
+    COUNTERS.clear()
+
+
+def get_counters() -> Dict[str, int]:
+    return dict(COUNTERS)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the solutions are modules in the repo root rather than a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
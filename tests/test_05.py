@@ -0,0 +1,83 @@
+"""Check the numpy and sweep line engines for day 5 against the original Grid/Line code."""
+
+import os
+import random
+
+import pytest
+
+from advent_05 import (
+    Grid,
+    Line,
+    Point,
+    count_overlapping_points,
+    count_overlapping_points_sweep,
+    filter_horizontal_and_vertical,
+    lines_to_endpoints,
+    parse_endpoints,
+    parse_lines,
+)
+
+
+def random_lines(rng: random.Random, n_lines: int, size: int) -> list:
+    """Random horizontal, vertical and diagonal lines (including single points) on a small grid."""
+    lines = []
+    for _ in range(n_lines):
+        x1, y1 = rng.randrange(size), rng.randrange(size)
+        dx, dy = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1), (-1, 0), (0, -1), (-1, -1), (-1, 1)])
+        length = rng.randrange(size)  # 0 gives a single point
+        x2 = min(max(x1 + dx * length, 0), size - 1)
+        y2 = y1 + dy * abs(x2 - x1) if dx else min(max(y1 + dy * length, 0), size - 1)
+        if dx and not 0 <= y2 < size:
+            x2, y2 = x1, y1
+        lines.append(Line(Point(x1, y1), Point(x2, y2)))
+    return lines
+
+
+def count_with_grid(lines: list, min_value: int) -> int:
+    grid = Grid()
+    for line in lines:
+        grid.mark_line(line)
+    return grid.count_marked_points(min_value)
+
+
+@pytest.mark.parametrize("seed", range(300))
+@pytest.mark.parametrize("min_value", [1, 2, 3])
+def test_engines_match_grid(seed: int, min_value: int):
+    rng = random.Random(seed)
+    lines = random_lines(rng, n_lines=rng.randint(1, 30), size=rng.randint(1, 20))
+    endpoints = lines_to_endpoints(lines)
+    expected = count_with_grid(lines, min_value)
+    assert count_overlapping_points(endpoints, min_value) == expected
+    assert count_overlapping_points(endpoints, min_value, dense_limit=0) == expected
+    for batch_points in [1, 7]:
+        assert count_overlapping_points(endpoints, min_value, batch_points=batch_points) == expected
+        assert count_overlapping_points(endpoints, min_value, dense_limit=0, batch_points=batch_points) == expected
+    assert count_overlapping_points_sweep(endpoints, min_value) == expected
+
+
+@pytest.mark.parametrize("min_value", [1, 2, 3])
+def test_single_points(min_value: int):
+    lines = [Line(Point(3, 4), Point(3, 4)), Line(Point(3, 4), Point(3, 4)), Line(Point(0, 4), Point(5, 4)),
+             Line(Point(1, 1), Point(1, 1)), Line(Point(0, 0), Point(2, 2))]
+    endpoints = lines_to_endpoints(lines)
+    expected = count_with_grid(lines, min_value)
+    assert count_overlapping_points(endpoints, min_value) == expected
+    assert count_overlapping_points(endpoints, min_value, dense_limit=0) == expected
+    assert count_overlapping_points_sweep(endpoints, min_value) == expected
+
+
+def test_horizontal_and_vertical_filter():
+    lines = random_lines(random.Random(0), n_lines=200, size=50)
+    endpoints = lines_to_endpoints(lines)
+    expected = count_with_grid([x for x in lines if x.is_horizontal() or x.is_vertical()], 2)
+    assert count_overlapping_points(filter_horizontal_and_vertical(endpoints), 2) == expected
+    assert count_overlapping_points_sweep(filter_horizontal_and_vertical(endpoints), 2) == expected
+
+
+def test_real_input():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "05.txt")
+    lines = parse_lines(path)
+    endpoints = parse_endpoints(path)
+    assert (endpoints == lines_to_endpoints(lines)).all()
+    assert count_overlapping_points_sweep(endpoints, 2) == count_overlapping_points(endpoints, 2) \
+        == count_with_grid(lines, 2)
@@ -0,0 +1,38 @@
+"""Check the tiled day 9 solver against the in-memory one, with bands small enough to split basins."""
+
+import os
+import random
+
+import numpy as np
+import pytest
+
+from advent_09 import find_largest_basins_fast, get_low_point_mask, parse_heightmap, score_low_points, solve_tiled
+
+
+def write_heightmap(path: str, heights: np.ndarray, final_newline: bool = True):
+    with open(path, "w") as f:
+        f.write("\n".join("".join(str(x) for x in row) for row in heights.tolist()) + ("\n" if final_newline else ""))
+
+
+def solve_in_memory(heights: np.ndarray, n: int = 3):
+    return score_low_points(heights, get_low_point_mask(heights)), find_largest_basins_fast(heights, n)
+
+
+@pytest.mark.parametrize("seed", range(400))
+def test_tiled_matches_in_memory(tmp_path, seed: int):
+    rng = random.Random(seed)
+    n_rows, n_cols = rng.randint(1, 15), rng.randint(1, 15)
+    np_rng = np.random.default_rng(seed)
+    heights = np.where(np_rng.random((n_rows, n_cols)) < rng.random(), 9, np_rng.integers(0, 9, (n_rows, n_cols)))
+    heights = heights.astype(np.uint8)
+    path = os.path.join(tmp_path, "heights.txt")
+    write_heightmap(path, heights, final_newline=rng.random() < 0.5)
+    expected = solve_in_memory(heights)
+    for band_rows in [1, 2, 3, 7]:
+        assert solve_tiled(path, 3, band_rows) == expected
+
+
+@pytest.mark.parametrize("band_rows", [1, 2, 3, 7, 64])
+def test_real_input(band_rows: int):
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "09.txt")
+    assert solve_tiled(path, 3, band_rows) == solve_in_memory(parse_heightmap(path)) == (500, [100, 99, 98])